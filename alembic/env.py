@@ -0,0 +1,63 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine
+from app.config import DATABASE_URL
+from app.db.base import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata for autogenerate)
+
+config = context.config
+
+# The alembic CLI configures logging from alembic.ini; the app (init_db) keeps its own
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # The SQLite FTS5 search table and its shadow tables are managed by migrations, not models
+    if type_ == "table" and name.startswith("product_search"):
+        return False
+    # PostgreSQL-only indexes (Index.ddl_if) do not exist elsewhere
+    if type_ == "index" and not reflected and obj._ddl_if is not None:
+        return obj._ddl_if.dialect in (None, context.get_context().dialect.name)
+    return True
+
+
+def configure(**kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite cannot ALTER constraints in place; batch mode recreates the table
+        render_as_batch=True,
+        **kwargs
+    )
+
+
+def run_migrations_offline() -> None:
+    configure(url=config.get_main_option("sqlalchemy.url") or DATABASE_URL, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # app.db.migrations passes the application's own connection
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(config.get_main_option("sqlalchemy.url") or DATABASE_URL)
+    with engine.connect() as connection:
+        configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
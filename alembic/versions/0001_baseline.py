@@ -0,0 +1,196 @@
+"""Baseline: the schema previously created by Base.metadata.create_all
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+
+Databases created by the old startup create_all before the product read model
+existed are already at this revision: `alembic stamp 0001_baseline`, then
+`alembic upgrade head`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('attribute',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('attribute_code', sa.Text(), nullable=False),
+    sa.Column('attribute_name_vn', sa.Text(), nullable=False),
+    sa.Column('attribute_name_en', sa.Text(), nullable=False),
+    sa.Column('type_attribute', sa.Enum('text', 'number', 'select', 'multi_select', name='attributetype'), nullable=False),
+    sa.Column('status', sa.Enum('active', 'deleted', name='attributestatus'), nullable=False),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attribute_attribute_code'), 'attribute', ['attribute_code'], unique=True)
+    op.create_index(op.f('ix_attribute_id'), 'attribute', ['id'], unique=False)
+    op.create_index(op.f('ix_attribute_status'), 'attribute', ['status'], unique=False)
+    op.create_index(op.f('ix_attribute_type_attribute'), 'attribute', ['type_attribute'], unique=False)
+    op.create_table('attribute_group',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('group_name', sa.Enum('product', 'sku', 'listing', 'item', 'country', name='attributegroupname'), nullable=False),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attribute_group_id'), 'attribute_group', ['id'], unique=False)
+    op.create_table('country',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('country_code', sa.Text(), nullable=False),
+    sa.Column('country_name_vn', sa.Text(), nullable=False),
+    sa.Column('country_name_en', sa.Text(), nullable=False),
+    sa.Column('type_country', sa.Enum('SINGLE_COUNTRY', 'MULTI_COUNTRY', name='countrytype'), nullable=False),
+    sa.Column('seo_url_key', sa.Text(), nullable=False),
+    sa.Column('is_popular', sa.Enum('YES', 'NO', name='ispopular'), nullable=False),
+    sa.Column('type_bidv', sa.Enum('SINGLE_COUNTRY', 'MULTI_COUNTRY', name='countrytype'), nullable=False),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_country_country_code'), 'country', ['country_code'], unique=True)
+    op.create_index(op.f('ix_country_id'), 'country', ['id'], unique=False)
+    op.create_index(op.f('ix_country_is_popular'), 'country', ['is_popular'], unique=False)
+    op.create_index(op.f('ix_country_type_country'), 'country', ['type_country'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_table('vendor',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('vendor_code', sa.String(length=50), nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=True),
+    sa.Column('vendor_name', sa.String(length=50), nullable=True),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_vendor_code'), 'vendor', ['code'], unique=True)
+    op.create_index(op.f('ix_vendor_id'), 'vendor', ['id'], unique=False)
+    op.create_index(op.f('ix_vendor_vendor_code'), 'vendor', ['vendor_code'], unique=True)
+    op.create_index(op.f('ix_vendor_vendor_name'), 'vendor', ['vendor_name'], unique=False)
+    op.create_table('attribute_group_link',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('attribute_id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['attribute_id'], ['attribute.id'], ),
+    sa.ForeignKeyConstraint(['group_id'], ['attribute_group.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attribute_group_link_attribute_id'), 'attribute_group_link', ['attribute_id'], unique=False)
+    op.create_index(op.f('ix_attribute_group_link_group_id'), 'attribute_group_link', ['group_id'], unique=False)
+    op.create_index(op.f('ix_attribute_group_link_id'), 'attribute_group_link', ['id'], unique=False)
+    op.create_table('attribute_option',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('attribute_code', sa.Text(), nullable=False),
+    sa.Column('attribute_option_vn', sa.Text(), nullable=False),
+    sa.Column('attribute_option_en', sa.Text(), nullable=False),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['attribute_code'], ['attribute.attribute_code'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attribute_option_attribute_code'), 'attribute_option', ['attribute_code'], unique=False)
+    op.create_index(op.f('ix_attribute_option_id'), 'attribute_option', ['id'], unique=False)
+    op.create_table('operator',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('operator_code', sa.String(length=50), nullable=False),
+    sa.Column('operator_name', sa.String(length=50), nullable=False),
+    sa.Column('country_code', sa.Text(), nullable=False),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['country_code'], ['country.country_code'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_operator_id'), 'operator', ['id'], unique=False)
+    op.create_index(op.f('ix_operator_operator_code'), 'operator', ['operator_code'], unique=True)
+    op.create_index(op.f('ix_operator_operator_name'), 'operator', ['operator_name'], unique=False)
+    op.create_table('product',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_code', sa.Text(), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'INACTIVE', 'LOW_STOCK', 'B2B_ONLY', 'TEMPORARY', 'PREPARING', 'DELETED', 'ECOM_ONLY', name='status'), nullable=False),
+    sa.Column('vendor_code', sa.Text(), nullable=False),
+    sa.Column('operator_code', sa.Text(), nullable=False),
+    sa.Column('supported_countries', sa.Text(), nullable=False),
+    sa.Column('note', sa.Text(), nullable=True),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['operator_code'], ['operator.operator_code'], ),
+    sa.ForeignKeyConstraint(['supported_countries'], ['country.country_code'], ),
+    sa.ForeignKeyConstraint(['vendor_code'], ['vendor.vendor_code'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_id'), 'product', ['id'], unique=False)
+    op.create_index(op.f('ix_product_product_code'), 'product', ['product_code'], unique=True)
+    op.create_table('product_attribute_value_index',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('attribute_id', sa.Integer(), nullable=False),
+    sa.Column('attribute_option_id', sa.Integer(), nullable=False),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['attribute_id'], ['attribute.id'], ),
+    sa.ForeignKeyConstraint(['attribute_option_id'], ['attribute_option.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('product_id', 'attribute_id', name='uq_product_attribute')
+    )
+    op.create_index(op.f('ix_product_attribute_value_index_attribute_id'), 'product_attribute_value_index', ['attribute_id'], unique=False)
+    op.create_index(op.f('ix_product_attribute_value_index_attribute_option_id'), 'product_attribute_value_index', ['attribute_option_id'], unique=False)
+    op.create_index(op.f('ix_product_attribute_value_index_id'), 'product_attribute_value_index', ['id'], unique=False)
+    op.create_index(op.f('ix_product_attribute_value_index_product_id'), 'product_attribute_value_index', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_product_attribute_value_index_product_id'), table_name='product_attribute_value_index')
+    op.drop_index(op.f('ix_product_attribute_value_index_id'), table_name='product_attribute_value_index')
+    op.drop_index(op.f('ix_product_attribute_value_index_attribute_option_id'), table_name='product_attribute_value_index')
+    op.drop_index(op.f('ix_product_attribute_value_index_attribute_id'), table_name='product_attribute_value_index')
+    op.drop_table('product_attribute_value_index')
+    op.drop_index(op.f('ix_product_product_code'), table_name='product')
+    op.drop_index(op.f('ix_product_id'), table_name='product')
+    op.drop_table('product')
+    op.drop_index(op.f('ix_operator_operator_name'), table_name='operator')
+    op.drop_index(op.f('ix_operator_operator_code'), table_name='operator')
+    op.drop_index(op.f('ix_operator_id'), table_name='operator')
+    op.drop_table('operator')
+    op.drop_index(op.f('ix_attribute_option_id'), table_name='attribute_option')
+    op.drop_index(op.f('ix_attribute_option_attribute_code'), table_name='attribute_option')
+    op.drop_table('attribute_option')
+    op.drop_index(op.f('ix_attribute_group_link_id'), table_name='attribute_group_link')
+    op.drop_index(op.f('ix_attribute_group_link_group_id'), table_name='attribute_group_link')
+    op.drop_index(op.f('ix_attribute_group_link_attribute_id'), table_name='attribute_group_link')
+    op.drop_table('attribute_group_link')
+    op.drop_index(op.f('ix_vendor_vendor_name'), table_name='vendor')
+    op.drop_index(op.f('ix_vendor_vendor_code'), table_name='vendor')
+    op.drop_index(op.f('ix_vendor_id'), table_name='vendor')
+    op.drop_index(op.f('ix_vendor_code'), table_name='vendor')
+    op.drop_table('vendor')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_country_type_country'), table_name='country')
+    op.drop_index(op.f('ix_country_is_popular'), table_name='country')
+    op.drop_index(op.f('ix_country_id'), table_name='country')
+    op.drop_index(op.f('ix_country_country_code'), table_name='country')
+    op.drop_table('country')
+    op.drop_index(op.f('ix_attribute_group_id'), table_name='attribute_group')
+    op.drop_table('attribute_group')
+    op.drop_index(op.f('ix_attribute_type_attribute'), table_name='attribute')
+    op.drop_index(op.f('ix_attribute_status'), table_name='attribute')
+    op.drop_index(op.f('ix_attribute_id'), table_name='attribute')
+    op.drop_index(op.f('ix_attribute_attribute_code'), table_name='attribute')
+    op.drop_table('attribute')
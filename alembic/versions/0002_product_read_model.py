@@ -0,0 +1,76 @@
+"""Product read model and search, one option per label
+
+Revision ID: 0002_product_read_model
+Revises: 0001_baseline
+Create Date: 2026-10-18
+
+- product_document: one JSON document per product plus its accent-folded
+  search text; a pg_trgm GIN index on PostgreSQL, an FTS5 trigram table kept
+  in sync by triggers on SQLite
+- attribute_option: unique (attribute_code, attribute_option_en), the
+  conflict target of POST /attribute_options/bulk
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0002_product_read_model"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5("
+    "search_text, content='product_document', content_rowid='product_id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS product_search_ai AFTER INSERT ON product_document BEGIN "
+    "INSERT INTO product_search(rowid, search_text) VALUES (new.product_id, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS product_search_ad AFTER DELETE ON product_document BEGIN "
+    "INSERT INTO product_search(product_search, rowid, search_text) VALUES ('delete', old.product_id, old.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS product_search_au AFTER UPDATE ON product_document BEGIN "
+    "INSERT INTO product_search(product_search, rowid, search_text) VALUES ('delete', old.product_id, old.search_text); "
+    "INSERT INTO product_search(rowid, search_text) VALUES (new.product_id, new.search_text); END",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table('product_document',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('product_code', sa.Text(), nullable=False),
+    sa.Column('document', sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'), nullable=False),
+    sa.Column('catalog_fingerprint', sa.Text(), nullable=False),
+    sa.Column('search_text', sa.Text(), server_default='', nullable=False),
+    sa.Column('date_created', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('last_modified_date', sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_index(op.f('ix_product_document_product_code'), 'product_document', ['product_code'], unique=True)
+    if dialect == "postgresql":
+        op.create_index(
+            'ix_product_document_search_trgm', 'product_document', ['search_text'], unique=False,
+            postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'}
+        )
+    elif dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+
+    with op.batch_alter_table('attribute_option') as batch_op:
+        batch_op.create_unique_constraint('uq_attribute_option_code_en', ['attribute_code', 'attribute_option_en'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('attribute_option') as batch_op:
+        batch_op.drop_constraint('uq_attribute_option_code_en', type_='unique')
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index('ix_product_document_search_trgm', table_name='product_document')
+    elif dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS product_search")
+    op.drop_index(op.f('ix_product_document_product_code'), table_name='product_document')
+    op.drop_table('product_document')
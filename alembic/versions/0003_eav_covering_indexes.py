@@ -0,0 +1,48 @@
+"""Composite and covering indexes for the product router's query shapes
+
+Revision ID: 0003_eav_covering_indexes
+Revises: 0002_product_read_model
+Create Date: 2026-10-18
+
+product_attribute_value_index:
+- (attribute_id, attribute_option_id, product_id): "all products with option X
+  of attribute Y" (attribute filters, facet counts) as an index-only scan
+- (product_id, attribute_id, attribute_option_id): "all attributes of product
+  P" (selectinload of a page, document rebuilds) as an index-only scan
+- the single-column product_id / attribute_id indexes are prefixes of these
+  and the id index duplicates the primary key; dropping them makes every
+  attribute value write maintain three fewer indexes
+
+product:
+- (status, id): status-filtered keyset pages
+- (last_modified_date, id): keyset pages ordered by last_modified_date
+"""
+from alembic import op
+
+
+revision = "0003_eav_covering_indexes"
+down_revision = "0002_product_read_model"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_pavi_attribute_option_product', 'product_attribute_value_index', ['attribute_id', 'attribute_option_id', 'product_id'], unique=False)
+    op.create_index('ix_pavi_product_attribute_option', 'product_attribute_value_index', ['product_id', 'attribute_id', 'attribute_option_id'], unique=False)
+    op.drop_index(op.f('ix_product_attribute_value_index_product_id'), table_name='product_attribute_value_index')
+    op.drop_index(op.f('ix_product_attribute_value_index_attribute_id'), table_name='product_attribute_value_index')
+    op.drop_index(op.f('ix_product_attribute_value_index_id'), table_name='product_attribute_value_index')
+
+    op.create_index('ix_product_status_id', 'product', ['status', 'id'], unique=False)
+    op.create_index('ix_product_last_modified_date_id', 'product', ['last_modified_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_last_modified_date_id', table_name='product')
+    op.drop_index('ix_product_status_id', table_name='product')
+
+    op.create_index(op.f('ix_product_attribute_value_index_id'), 'product_attribute_value_index', ['id'], unique=False)
+    op.create_index(op.f('ix_product_attribute_value_index_attribute_id'), 'product_attribute_value_index', ['attribute_id'], unique=False)
+    op.create_index(op.f('ix_product_attribute_value_index_product_id'), 'product_attribute_value_index', ['product_id'], unique=False)
+    op.drop_index('ix_pavi_product_attribute_option', table_name='product_attribute_value_index')
+    op.drop_index('ix_pavi_attribute_option_product', table_name='product_attribute_value_index')
@@ -1,16 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
+from app.config import FAST_JSON_RESPONSES
 from app.db.session import get_db
 from app.models.attribute import Attribute
+from app.models.attribute_group import AttributeGroup
 from app.models.attribute_group_link import AttributeGroupLink
 from app.schemas.attribute import AttributeCreate, AttributeUpdate, AttributeOut
+from app.utils.attribute_catalog import invalidate_attribute_catalog
+from app.utils.conditional import check_not_modified, collection_validators, collection_version
+from app.utils.fast_json import FastJSONResponse
+from app.utils.product_documents import refresh_attribute_documents
 
 router = APIRouter()
 
 @router.get("/", response_model=List[AttributeOut])
-def get_attributes(db: Session = Depends(get_db)):
+def get_attributes(request: Request, response: Response, db: Session = Depends(get_db)):
     """Get all attributes"""
+    # The group name shown for each attribute comes from its group links
+    etag, last_modified = collection_validators(
+        collection_version(db.query(Attribute), Attribute),
+        collection_version(db.query(AttributeGroupLink), AttributeGroupLink),
+        collection_version(db.query(AttributeGroup), AttributeGroup)
+    )
+    not_modified = check_not_modified(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    
     attributes = db.query(Attribute).options(joinedload(Attribute.attribute_group_links).joinedload(AttributeGroupLink.attribute_group)).all()
     result = []
     for attr in attributes:
@@ -26,8 +42,11 @@ def get_attributes(db: Session = Depends(get_db)):
             "date_created": attr.date_created,
             "last_modified_date": attr.last_modified_date
         }
-        result.append(AttributeOut(**attr_dict))
-    return result
+        result.append(attr_dict)
+    
+    if FAST_JSON_RESPONSES:
+        return FastJSONResponse(result, headers=response.headers)
+    return [AttributeOut(**attr_dict) for attr_dict in result]
 
 @router.post("/", response_model=AttributeOut)
 def create_attribute(attribute: AttributeCreate, db: Session = Depends(get_db)):
@@ -39,6 +58,7 @@ def create_attribute(attribute: AttributeCreate, db: Session = Depends(get_db)):
     db.add(db_attribute)
     db.commit()
     db.refresh(db_attribute)
+    invalidate_attribute_catalog()
     
     # Reload with attribute group
     db_attribute = db.query(Attribute).options(joinedload(Attribute.attribute_group)).filter(Attribute.id == db_attribute.id).first()
@@ -100,9 +120,13 @@ def get_attribute_by_code(attribute_code: str, db: Session = Depends(get_db)):
     return AttributeOut(**attr_dict)
 
 @router.put("/{attribute_id}", response_model=AttributeOut)
-def update_attribute(attribute_id: int, attribute: AttributeUpdate, db: Session = Depends(get_db)):
+def update_attribute(
+    attribute_id: int, attribute: AttributeUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     """Update a attribute"""
-    db_attribute = db.query(Attribute).options(joinedload(Attribute.attribute_group)).filter(Attribute.id == attribute_id).first()
+    db_attribute = db.query(Attribute).options(
+        joinedload(Attribute.attribute_group_links).joinedload(AttributeGroupLink.attribute_group)
+    ).filter(Attribute.id == attribute_id).first()
     if not db_attribute:
         raise HTTPException(status_code=404, detail="attribute not found")
     
@@ -114,13 +138,14 @@ def update_attribute(attribute_id: int, attribute: AttributeUpdate, db: Session
         db_attribute.attribute_name_en = attribute.attribute_name_en
     if attribute.type_attribute is not None:
         db_attribute.type_attribute = attribute.type_attribute
-    if attribute.attribute_group_id is not None:
-        db_attribute.attribute_group_id = attribute.attribute_group_id
     if attribute.status is not None:
         db_attribute.status = attribute.status
     
     db.commit()
     db.refresh(db_attribute)
+    invalidate_attribute_catalog()
+    # Stored product documents are keyed by attribute code: rebuild the ones using this attribute
+    background_tasks.add_task(refresh_attribute_documents, [attribute_id])
     
     attr_dict = {
         "id": db_attribute.id,
@@ -130,7 +155,7 @@ def update_attribute(attribute_id: int, attribute: AttributeUpdate, db: Session
         "type_attribute": db_attribute.type_attribute.value if db_attribute.type_attribute else None,
         # "attribute_group_id": db_attribute.attribute_group_id,
         "status": db_attribute.status,
-        "attribute_group_name": db_attribute.attribute_group.group_name.value if db_attribute.attribute_group else None,
+        "attribute_group_name": db_attribute.attribute_group_links[0].attribute_group.group_name.value if db_attribute.attribute_group_links else None,
         "date_created": db_attribute.date_created,
         "last_modified_date": db_attribute.last_modified_date
     }
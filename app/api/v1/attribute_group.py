@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.session import get_db
 from app.models.attribute_group import AttributeGroup
 from app.schemas.attribute_group import AttributeGroupCreate, AttributeGroupUpdate, AttributeGroupOut
+from app.utils.conditional import check_not_modified, row_validators
+from app.utils.response_cache import cached_list_response, invalidate_reference_cache, reference_list
+from app.utils.attribute_catalog import invalidate_attribute_catalog
 
 router = APIRouter()
 
+@reference_list("attribute_groups", List[AttributeGroupOut])
+def load_attribute_groups(db: Session):
+    return db.query(AttributeGroup).all()
+
 @router.get("/", response_model=List[AttributeGroupOut])
-def get_attribute_groups(db: Session = Depends(get_db)):
+def get_attribute_groups(request: Request, db: Session = Depends(get_db)):
     """Get all attribute_groups"""
-    return db.query(AttributeGroup).all()
+    return cached_list_response(request, "attribute_groups", List[AttributeGroupOut], lambda: load_attribute_groups(db))
 
 @router.post("/", response_model=AttributeGroupOut)
 def create_attribute_group(attribute_group: AttributeGroupCreate, db: Session = Depends(get_db)):
@@ -19,22 +26,30 @@ def create_attribute_group(attribute_group: AttributeGroupCreate, db: Session =
     db.add(db_attribute_group)
     db.commit()
     db.refresh(db_attribute_group)
+    invalidate_attribute_catalog()
+    invalidate_reference_cache("attribute_groups")
     return db_attribute_group
 
 @router.get("/{attribute_id}", response_model=AttributeGroupOut)
-def get_attribute_group(attribute_id: int, db: Session = Depends(get_db)):    
+def get_attribute_group(attribute_id: int, request: Request, response: Response, db: Session = Depends(get_db)):    
     """Get a attribute_group by ID"""
     db_attribute_group = db.query(AttributeGroup).filter(AttributeGroup.id == attribute_id).first()
     if not db_attribute_group:
         raise HTTPException(status_code=404, detail="attribute_group not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_attribute_group))
+    if not_modified:
+        return not_modified
     return db_attribute_group
 
 @router.get("/code/{attribute_code}", response_model=AttributeGroupOut)
-def get_attribute_group_by_code(attribute_code: str, db: Session = Depends(get_db)):
+def get_attribute_group_by_code(attribute_code: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get a attribute_group by code"""
     db_attribute_group = db.query(AttributeGroup).filter(AttributeGroup.group_name == attribute_code).first()
     if not db_attribute_group:
         raise HTTPException(status_code=404, detail="attribute_group not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_attribute_group))
+    if not_modified:
+        return not_modified
     return db_attribute_group   
 
 @router.put("/{attribute_id}", response_model=AttributeGroupOut)
@@ -46,4 +61,6 @@ def update_attribute_group(attribute_id: int, attribute_group: AttributeGroupUpd
     db_attribute_group.group_name = attribute_group.group_name
     db.commit()
     db.refresh(db_attribute_group)
+    invalidate_attribute_catalog()
+    invalidate_reference_cache("attribute_groups")
     return db_attribute_group
\ No newline at end of file
@@ -1,47 +1,129 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.session import get_db
+from app.models.attribute import Attribute
 from app.models.attribute_option import AttributeOption
-from app.schemas.attribute_option import AttributeOptionCreate, AttributeOptionUpdate, AttributeOptionOut
+from app.schemas.attribute_option import (
+    AttributeOptionCreate, AttributeOptionUpdate, AttributeOptionOut, AttributeOptionBulkUpsert, AttributeOptionBulkResult
+)
+from app.utils.conditional import check_not_modified, row_validators
+from app.utils.response_cache import cached_list_response, invalidate_reference_cache, reference_list
+from app.utils.attribute_catalog import invalidate_attribute_catalog
+from app.utils.product_documents import refresh_option_documents
+from app.utils.upsert import upsert_insert
 
 router = APIRouter()
 
+# Rows per INSERT statement (4 bound parameters each, well under SQLite's variable limit)
+BULK_UPSERT_CHUNK_SIZE = 1000
+
+@reference_list("attribute_options", List[AttributeOptionOut])
+def load_attribute_options(db: Session):
+    return db.query(AttributeOption).all()
+
 @router.get("/", response_model=List[AttributeOptionOut])
-def get_attribute_options(db: Session = Depends(get_db)):
+def get_attribute_options(request: Request, db: Session = Depends(get_db)):
     """Get all attribute_options"""
-    return db.query(AttributeOption).all()
+    return cached_list_response(request, "attribute_options", List[AttributeOptionOut], lambda: load_attribute_options(db))
 
 @router.post("/", response_model=AttributeOptionOut)
 def create_attribute_option(attribute_option: AttributeOptionCreate, db: Session = Depends(get_db)):
     """Create a new attribute option"""
-    existing_attribute_option = db.query(AttributeOption).filter(AttributeOption.attribute_code == attribute_option.attribute_code).first()
+    existing_attribute_option = db.query(AttributeOption).filter(
+        AttributeOption.attribute_code == attribute_option.attribute_code,
+        AttributeOption.attribute_option_en == attribute_option.attribute_option_en
+    ).first()
     if existing_attribute_option:
         raise HTTPException(status_code=400, detail="Attribute option already exists")
     db_attribute_option = AttributeOption(**attribute_option.model_dump())
     db.add(db_attribute_option)
     db.commit()
     db.refresh(db_attribute_option)
+    invalidate_attribute_catalog()
+    invalidate_reference_cache("attribute_options")
     return db_attribute_option
 
+@router.post("/bulk", response_model=AttributeOptionBulkResult)
+def bulk_upsert_attribute_options(payload: AttributeOptionBulkUpsert, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """Insert or update many attribute options with INSERT ... ON CONFLICT (attribute_code, attribute_option_en)"""
+    # The same option twice in one statement would make ON CONFLICT DO UPDATE touch a row twice; last one wins
+    options = {}
+    for option in payload.options:
+        options[(option.attribute_code, option.attribute_option_en)] = option
+    if not options:
+        return AttributeOptionBulkResult(total=0, ids=[])
+
+    codes = {code for code, _ in options}
+    known = set(db.execute(select(Attribute.attribute_code).where(Attribute.attribute_code.in_(codes))).scalars())
+    unknown = sorted(codes - known)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown attribute codes: {', '.join(unknown)}")
+
+    rows = [
+        {
+            "attribute_code": option.attribute_code,
+            "attribute_option_en": option.attribute_option_en,
+            "attribute_option_vn": option.attribute_option_vn or option.attribute_option_en,
+        }
+        for option in options.values()
+    ]
+    stmt = upsert_insert(db, AttributeOption)
+    conflict = [AttributeOption.attribute_code, AttributeOption.attribute_option_en]
+    returning = (AttributeOption.id, AttributeOption.attribute_code, AttributeOption.attribute_option_en)
+    # New rows without a VN label fall back to the EN one, but an existing VN label is only
+    # replaced when the payload sends one
+    statements = {
+        True: stmt.on_conflict_do_update(
+            index_elements=conflict,
+            set_={"attribute_option_vn": stmt.excluded.attribute_option_vn, "last_modified_date": func.now()},
+        ).returning(*returning),
+        False: stmt.on_conflict_do_update(
+            index_elements=conflict, set_={"last_modified_date": func.now()},
+        ).returning(*returning),
+    }
+
+    ids_by_key = {}
+    for has_vn, statement in statements.items():
+        group = [row for row, option in zip(rows, options.values()) if bool(option.attribute_option_vn) == has_vn]
+        for start in range(0, len(group), BULK_UPSERT_CHUNK_SIZE):
+            for option_id, code, option_en in db.execute(statement.values(group[start:start + BULK_UPSERT_CHUNK_SIZE])):
+                ids_by_key[(code, option_en)] = option_id
+    db.commit()
+    invalidate_attribute_catalog()
+    invalidate_reference_cache("attribute_options")
+    # Labels of existing options may have changed: products using them need new search_text
+    background_tasks.add_task(refresh_option_documents, list(ids_by_key.values()))
+    # RETURNING order is not guaranteed; report ids in request order
+    return AttributeOptionBulkResult(total=len(rows), ids=[ids_by_key[key] for key in options])
+
 @router.get("/{attribute_id}", response_model=AttributeOptionOut)
-def get_attribute_option(attribute_id: int, db: Session = Depends(get_db)):    
+def get_attribute_option(attribute_id: int, request: Request, response: Response, db: Session = Depends(get_db)):    
     """Get a attribute_option by ID"""
     db_attribute_option = db.query(AttributeOption).filter(AttributeOption.id == attribute_id).first()
     if not db_attribute_option:
         raise HTTPException(status_code=404, detail="attribute_option not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_attribute_option))
+    if not_modified:
+        return not_modified
     return db_attribute_option
 
 @router.get("/code/{attribute_code}", response_model=AttributeOptionOut)
-def get_attribute_option_by_code(attribute_code: str, db: Session = Depends(get_db)):
+def get_attribute_option_by_code(attribute_code: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get a attribute_option by code"""
     db_attribute_option = db.query(AttributeOption).filter(AttributeOption.attribute_code == attribute_code).first()
     if not db_attribute_option:
         raise HTTPException(status_code=404, detail="attribute_option not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_attribute_option))
+    if not_modified:
+        return not_modified
     return db_attribute_option
 
 @router.put("/{attribute_id}", response_model=AttributeOptionOut)
-def update_attribute_option(attribute_id: int, attribute_option: AttributeOptionUpdate, db: Session = Depends(get_db)):
+def update_attribute_option(
+    attribute_id: int, attribute_option: AttributeOptionUpdate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
     """Update a attribute_option"""
     db_attribute_option = db.query(AttributeOption).filter(AttributeOption.id == attribute_id).first()
     if not db_attribute_option:
@@ -51,4 +133,7 @@ def update_attribute_option(attribute_id: int, attribute_option: AttributeOption
     db_attribute_option.attribute_option_en = attribute_option.attribute_option_en
     db.commit()
     db.refresh(db_attribute_option)
+    invalidate_attribute_catalog()
+    invalidate_reference_cache("attribute_options")
+    background_tasks.add_task(refresh_option_documents, [db_attribute_option.id])
     return db_attribute_option
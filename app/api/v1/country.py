@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.session import get_db
 from app.models.country import Country
 from app.schemas.country import CountryCreate, CountryUpdate, CountryOut
+from app.utils.conditional import check_not_modified, row_validators
+from app.utils.response_cache import cached_list_response, invalidate_reference_cache, reference_list
 
 router = APIRouter()
 
+@reference_list("countries", List[CountryOut])
+def load_countries(db: Session):
+    return db.query(Country).all()
+
 @router.get("/", response_model=List[CountryOut])
-def get_countries(db: Session = Depends(get_db)):
+def get_countries(request: Request, db: Session = Depends(get_db)):
     """Get all countries"""
-    return db.query(Country).all()
+    return cached_list_response(request, "countries", List[CountryOut], lambda: load_countries(db))
 
 @router.post("/", response_model=CountryOut)
 def create_country(country: CountryCreate, db: Session = Depends(get_db)):
@@ -22,22 +28,29 @@ def create_country(country: CountryCreate, db: Session = Depends(get_db)):
     db.add(db_country)
     db.commit()
     db.refresh(db_country)
+    invalidate_reference_cache("countries", "operators")
     return db_country
 
 @router.get("/{country_id}", response_model=CountryOut)
-def get_country(country_id: int, db: Session = Depends(get_db)):
+def get_country(country_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get a country by ID"""
     db_country = db.query(Country).filter(Country.id == country_id).first()
     if not db_country:
         raise HTTPException(status_code=404, detail="Country not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_country))
+    if not_modified:
+        return not_modified
     return db_country
 
 @router.get("/code/{country_code}", response_model=CountryOut)
-def get_country_by_code(country_code: str, db: Session = Depends(get_db)):
+def get_country_by_code(country_code: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get a country by code"""
     db_country = db.query(Country).filter(Country.country_code == country_code).first()
     if not db_country:
         raise HTTPException(status_code=404, detail="Country not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_country))
+    if not_modified:
+        return not_modified
     return db_country
 
 @router.put("/{country_id}", response_model=CountryOut)
@@ -46,6 +59,11 @@ def update_country(country_id: int, country: CountryUpdate, db: Session = Depend
     db_country = db.query(Country).filter(Country.id == country_id).first()
     if not db_country:
         raise HTTPException(status_code=404, detail="Country not found")
-    db_country.country_code = country.country_code
-    db_country.code = country.code
-    db_country.country_name = country.country_name
+    
+    for field, value in country.model_dump(exclude_none=True).items():
+        setattr(db_country, field, value)
+    
+    db.commit()
+    db.refresh(db_country)
+    invalidate_reference_cache("countries", "operators")
+    return db_country
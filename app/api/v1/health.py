@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.utils.warmup import startup_state
+
+router = APIRouter()
+
+@router.get("/live")
+async def live():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "alive"}
+
+@router.get("/ready")
+async def ready():
+    """Readiness: 200 once warm-up has finished, 503 before that and while shutting down"""
+    state = startup_state.as_dict()
+    if not startup_state.ready:
+        return JSONResponse({"status": "starting", **state}, status_code=503)
+    return {"status": "ready", **state}
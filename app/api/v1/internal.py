@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.db import session
+from app.db.pool_metrics import pool_status
+from app.db.session import get_db
+from app.utils.attribute_catalog import attribute_catalog_cache
+from app.utils.facet_index import facet_index
+from app.utils.response_cache import reference_cache
+
+router = APIRouter()
+
+@router.get("/attribute-catalog")
+def get_attribute_catalog_stats():
+    """Show the age, version and hit ratio of the attribute catalog cache"""
+    return attribute_catalog_cache.stats()
+
+@router.post("/attribute-catalog/invalidate")
+def invalidate_attribute_catalog_cache():
+    """Force the attribute catalog to be reloaded on the next request"""
+    version = attribute_catalog_cache.invalidate()
+    return {"message": "Attribute catalog invalidated", "version": version}
+
+@router.get("/response-cache")
+def get_response_cache_stats():
+    """Show hits, misses and entry ages of the reference-data response cache"""
+    return reference_cache.stats()
+
+@router.post("/response-cache/invalidate")
+def invalidate_response_cache():
+    """Drop every cached reference-data response"""
+    reference_cache.invalidate()
+    return {"message": "Response cache invalidated"}
+
+@router.get("/db-pool")
+def get_db_pool_stats():
+    """Show connection pool occupancy, overflow and checkout wait times"""
+    pools = {"sync": pool_status(session.engine)}
+    if session.async_engine is not None:
+        pools["async"] = pool_status(session.async_engine.sync_engine)
+    return pools
+
+@router.get("/facet-index")
+def get_facet_index_stats():
+    """Show the size, age and sync counters of the in-process facet index"""
+    return facet_index.stats()
+
+@router.post("/facet-index/rebuild")
+def rebuild_facet_index(db: Session = Depends(get_db)):
+    """Reload the facet index from the database"""
+    facet_index.load(db)
+    return {"message": "Facet index rebuilt", **facet_index.stats()}
@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.db import session
+from app.db.pool_metrics import pool_status
+from app.utils.metrics import metrics_registry
+from app.utils.response_cache import reference_cache
+
+router = APIRouter()
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _pool_gauges(prefix: str, engine) -> dict:
+    return {
+        f"{prefix}_{name}": value
+        for name, value in pool_status(engine).items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus metrics; async so it reads the registry on the thread that updates it"""
+    gauges = _pool_gauges("db_pool", session.engine)
+    if session.async_engine is not None:
+        gauges.update(_pool_gauges("db_async_pool", session.async_engine.sync_engine))
+    gauges["reference_cache_hits"] = reference_cache.hits
+    gauges["reference_cache_misses"] = reference_cache.misses
+    return PlainTextResponse(metrics_registry.render(gauges), media_type=PROMETHEUS_MEDIA_TYPE)
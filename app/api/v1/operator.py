@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from app.db.session import get_db
 from app.models.operator import Operator
 from app.schemas.operator import OperatorCreate, OperatorUpdate, OperatorOut
+from app.utils.conditional import check_not_modified, row_validators
+from app.utils.response_cache import cached_list_response, invalidate_reference_cache, reference_list
 
 router = APIRouter()
 
+@reference_list("operators", List[OperatorOut])
+def load_operators(db: Session):
+    return db.query(Operator).options(joinedload(Operator.country)).all()
+
 @router.get("/", response_model=List[OperatorOut])
-def get_operators(db: Session = Depends(get_db)):
+def get_operators(request: Request, db: Session = Depends(get_db)):
     """Get all operators"""
-    return db.query(Operator).all()
+    return cached_list_response(request, "operators", List[OperatorOut], lambda: load_operators(db))
 
 @router.post("/", response_model=OperatorOut)
 def create_operator(operator: OperatorCreate, db: Session = Depends(get_db)):
@@ -25,22 +31,29 @@ def create_operator(operator: OperatorCreate, db: Session = Depends(get_db)):
     db.add(db_operator)
     db.commit()
     db.refresh(db_operator)
+    invalidate_reference_cache("operators")
     return db_operator
 
 @router.get("/{operator_id}", response_model=OperatorOut)
-def get_operator(operator_id: int, db: Session = Depends(get_db)):
+def get_operator(operator_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get an operator by ID"""
     db_operator = db.query(Operator).filter(Operator.id == operator_id).first()
     if not db_operator:
         raise HTTPException(status_code=404, detail="Operator not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_operator, db_operator.country))
+    if not_modified:
+        return not_modified
     return db_operator
 
 @router.get("/code/{operator_code}", response_model=OperatorOut)
-def get_operator_by_code(operator_code: str, db: Session = Depends(get_db)):
+def get_operator_by_code(operator_code: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get an operator by code"""
     db_operator = db.query(Operator).filter(Operator.operator_code == operator_code).first()
     if not db_operator:
         raise HTTPException(status_code=404, detail="Operator not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_operator, db_operator.country))
+    if not_modified:
+        return not_modified
     return db_operator
 
 @router.put("/{operator_id}", response_model=OperatorOut)
@@ -59,4 +72,5 @@ def update_operator(operator_id: int, operator: OperatorUpdate, db: Session = De
     
     db.commit()
     db.refresh(db_operator)
+    invalidate_reference_cache("operators")
     return db_operator
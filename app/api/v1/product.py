@@ -1,16 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional, Any
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert, or_, update
+from sqlalchemy.orm import Session, selectinload
+from typing import Optional
+from app.config import FACET_INDEX_ENABLED, FAST_JSON_RESPONSES
 from app.db.session import get_db
 from app.models.product import Product
-from app.models.attribute import Attribute
-from app.models.attribute_group import AttributeGroup, AttributeGroupName
-from app.models.attribute_option import AttributeOption
 from app.models.product_attribute_value_index import ProductAttributeValueIndex
-from app.models.attribute_group_link import AttributeGroupLink
 from app.utils.enums.status import Status
+from app.utils.attribute_catalog import get_attribute_catalog, get_product_attributes
+from app.utils.attribute_resolver import (
+    AttributeResolutionError, load_attribute_option_lookup, resolve_attribute_values
+)
+from app.utils.product_import import ProductBulkImporter, iter_ndjson_lines
+from app.utils.attribute_filters import apply_attribute_filters, facet_counts, parse_attribute_filters
+from app.utils.pagination import InvalidCursor, apply_keyset, decode_cursor, encode_cursor, estimate_total, next_cursor_for
+from app.utils.product_export import iter_product_batches, iter_products_csv, iter_products_ndjson
+from app.utils.fast_json import FastJSONResponse, row_dict
+from app.utils.facet_index import facet_index, get_facet_index
+from app.utils.product_documents import (
+    DOCUMENT_REFRESH_CHUNK_SIZE, get_product_document, get_product_documents, refresh_product_documents
+)
+from app.utils.product_search import search_product_documents
+from app.utils.conditional import (
+    check_not_modified, content_etag, page_validators, row_validators
+)
 from app.schemas.product import (
-    ProductOut, ProductList, AvailableAttribute, AvailableAttributesResponse,
+    ProductOut, ProductList, AvailableAttributesResponse, ProductBulkResult, ProductSearchResult,
+    ProductBatchGet, ProductBatchGetResult, ProductBulkStatusUpdate, ProductBulkStatusResult,
     create_dynamic_product_create_schema, create_dynamic_product_update_schema,
     create_dynamic_product_out_schema, format_product_for_dynamic_schema,
     extract_attributes_from_request
@@ -18,40 +38,31 @@ from app.schemas.product import (
 
 router = APIRouter()
 
-def get_product_attributes(db: Session) -> list[AvailableAttribute]:
-    """Get all available attributes for the 'product' group"""
-    # Temporarily get all attributes until database is updated with attribute_group_id column
-    attributes = db.query(Attribute).join(AttributeGroupLink).join(AttributeGroup).filter(
-        AttributeGroup.group_name == AttributeGroupName.product
-    ).options(
-        joinedload(Attribute.attribute_group_links).joinedload(AttributeGroupLink.attribute_group),
-        joinedload(Attribute.attribute_options)
-    ).all()
-    
-    available_attributes = []
-    for attr in attributes:
-        options = [
-            {
-                "id": opt.id,
-                "attribute_option_en": opt.attribute_option_en,
-                "attribute_option_vn": opt.attribute_option_vn
-            }
-            for opt in attr.attribute_options
-        ]
-        
-        # Temporarily set group name as "Product" until database is updated with attribute_group_id column
-        group_name = "Product"
-        
-        available_attributes.append(AvailableAttribute(
-            attribute_code=attr.attribute_code,
-            attribute_name_en=attr.attribute_name_en,
-            attribute_name_vn=attr.attribute_name_vn,
-            type_attribute=attr.type_attribute.value,
-            attribute_group=group_name,
-            options=options
-        ))
-    
-    return available_attributes
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines"}
+
+def write_product_attribute_values(
+    db: Session, product_id: int, resolved_values: list[tuple[int, Optional[int]]], replace: bool = False
+):
+    """Store resolved (attribute_id, attribute_option_id) pairs with set-based statements"""
+    if replace and resolved_values:
+        # Remove existing values of every attribute being updated in one statement
+        db.query(ProductAttributeValueIndex).filter(
+            ProductAttributeValueIndex.product_id == product_id,
+            ProductAttributeValueIndex.attribute_id.in_([attribute_id for attribute_id, _ in resolved_values])
+        ).delete(synchronize_session=False)
+    
+    # Only non-empty values are stored, as one multi-row insert
+    new_values = [
+        {"product_id": product_id, "attribute_id": attribute_id, "attribute_option_id": option_id}
+        for attribute_id, option_id in resolved_values
+        if option_id is not None
+    ]
+    if new_values:
+        db.execute(insert(ProductAttributeValueIndex), new_values)
+
+def document_not_modified(request: Request, response: Response, document: dict) -> Optional[Response]:
+    """Conditional GET for a product document, validated by a hash of the document itself"""
+    return check_not_modified(request, response, content_etag(document), datetime.fromisoformat(document["last_modified_date"]))
 
 @router.get("/available-attributes", response_model=AvailableAttributesResponse)
 def get_available_attributes(db: Session = Depends(get_db)):
@@ -65,10 +76,11 @@ def create_product(request_data: dict, db: Session = Depends(get_db)):
     """Create a new product with dynamic attributes"""
     
     # Get available attributes to validate against
-    attributes = get_product_attributes(db)
+    catalog = get_attribute_catalog(db)
+    attributes = catalog.attributes
     
     # Create dynamic schema and validate request
-    ProductCreateSchema = create_dynamic_product_create_schema(attributes)
+    ProductCreateSchema = create_dynamic_product_create_schema(attributes, catalog.fingerprint)
     
     try:
         validated_data = ProductCreateSchema(**request_data)
@@ -90,156 +102,363 @@ def create_product(request_data: dict, db: Session = Depends(get_db)):
         'note': validated_data.note,
     }
     
+    # Extract and resolve dynamic attributes in one query before touching the product
+    attribute_values = extract_attributes_from_request(request_data, attributes)
+    try:
+        resolved_values = resolve_attribute_values(
+            load_attribute_option_lookup(db, attribute_values.keys()), attribute_values
+        )
+    except AttributeResolutionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     db_product = Product(**base_product_data)
     db.add(db_product)
+    db.flush()
+    
+    write_product_attribute_values(db, db_product.id, resolved_values)
+    # Keep the read model in the same transaction; it is also the response
+    documents = refresh_product_documents(db, [db_product.id], catalog)
     db.commit()
-    db.refresh(db_product)
+    facet_index.mark_stale()
     
-    # Extract and handle dynamic attributes
-    attribute_values = extract_attributes_from_request(request_data, attributes)
+    return documents[0]
+
+@router.post("/bulk", response_model=ProductBulkResult)
+async def bulk_create_products(
+    request: Request,
+    chunk_size: int = Query(500, ge=1, le=5000, description="Number of products inserted per transaction"),
+    db: Session = Depends(get_db)
+):
+    """Create many products from a JSON array or an NDJSON stream.
+
+    Rows are validated against the cached attribute catalog and inserted in
+    chunked transactions; invalid rows are reported instead of failing the batch.
+    `row` in the report is the 0-based position of the product in the payload.
+    """
+    catalog = await run_in_threadpool(get_attribute_catalog, db)
+    importer = ProductBulkImporter(db, catalog)
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
     
-    for attribute_code, option_value in attribute_values.items():
-        if option_value:  # Only process non-empty values
-            # Find the attribute
-            attribute = db.query(Attribute).filter(
-                Attribute.attribute_code == attribute_code
-            ).first()
-            if not attribute:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Attribute '{attribute_code}' not found in product group"
-                )
-            
-            # Find the attribute option
-            attribute_option = None
-            if option_value.isdigit():
-                # Try to find by ID first
-                attribute_option = db.query(AttributeOption).filter(
-                    AttributeOption.id == int(option_value),
-                    AttributeOption.attribute_code == attribute_code
-                ).first()
-            
-            if not attribute_option:
-                # Try to find by text (English or Vietnamese)
-                attribute_option = db.query(AttributeOption).filter(
-                    AttributeOption.attribute_code == attribute_code,
-                    (AttributeOption.attribute_option_en == option_value) |
-                    (AttributeOption.attribute_option_vn == option_value)
-                ).first()
-            
-            if not attribute_option:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Attribute option '{option_value}' not found for attribute '{attribute_code}'"
-                )
-            
-            # Create the mapping
-            pavi = ProductAttributeValueIndex(
-                product_id=db_product.id,
-                attribute_id=attribute.id,
-                attribute_option_id=attribute_option.id
-            )
-            db.add(pavi)
+    if content_type in NDJSON_MEDIA_TYPES:
+        # Import while the body is still streaming in
+        chunk = []
+        row = 0
+        async for line in iter_ndjson_lines(request.stream()):
+            chunk.append((row, line))
+            row += 1
+            if len(chunk) >= chunk_size:
+                await run_in_threadpool(importer.import_chunk, chunk)
+                chunk = []
+        if chunk:
+            await run_in_threadpool(importer.import_chunk, chunk)
+    else:
+        try:
+            payload = json.loads(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {str(e)}")
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of products")
+        
+        rows = list(enumerate(payload))
+        for start in range(0, len(rows), chunk_size):
+            await run_in_threadpool(importer.import_chunk, rows[start:start + chunk_size])
     
-    db.commit()
-    db.refresh(db_product)
+    facet_index.mark_stale()
+    return importer.result()
+
+@router.post("/bulk-status", response_model=ProductBulkStatusResult)
+def bulk_update_product_status(payload: ProductBulkStatusUpdate, db: Session = Depends(get_db)):
+    """Move every product matching the filters to a new status (Deleted = bulk soft delete).
+
+    Runs as one UPDATE ... RETURNING id that also bumps last_modified_date;
+    products already in the target status are left untouched.
+    """
+    conditions = []
+    if payload.ids is not None:
+        conditions.append(Product.id.in_(payload.ids))
+    if payload.vendor_code is not None:
+        conditions.append(Product.vendor_code == payload.vendor_code)
+    if payload.operator_code is not None:
+        conditions.append(Product.operator_code == payload.operator_code)
+    if payload.supported_countries is not None:
+        conditions.append(Product.supported_countries == payload.supported_countries)
+    if payload.current_status is not None:
+        conditions.append(Product.status == payload.current_status)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="At least one filter is required")
     
-    # Format response using dynamic schema
-    ProductOutSchema = create_dynamic_product_out_schema(attributes)
-    response_data = format_product_for_dynamic_schema(db_product, attributes)
+    product_ids = sorted(db.execute(
+        update(Product)
+        .where(*conditions, Product.status != payload.status)
+        .values(status=payload.status, last_modified_date=func.now())
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    ).scalars())
+    if product_ids:
+        catalog = get_attribute_catalog(db)
+        for start in range(0, len(product_ids), DOCUMENT_REFRESH_CHUNK_SIZE):
+            refresh_product_documents(db, product_ids[start:start + DOCUMENT_REFRESH_CHUNK_SIZE], catalog)
+    db.commit()
+    facet_index.mark_stale()
+    return ProductBulkStatusResult(status=payload.status, updated=len(product_ids), ids=product_ids)
+
+@router.post("/batch-get", response_model=ProductBatchGetResult)
+def batch_get_products(
+    payload: ProductBatchGet,
+    dynamic_schema: bool = Query(True, description="Use dynamic schema with attribute fields"),
+    db: Session = Depends(get_db)
+):
+    """Fetch many products by id and/or product code in one request.
+
+    Products come back in request order (ids first, then codes), each once;
+    keys that match no product are listed in missing_ids / missing_codes.
+    """
+    ids = list(dict.fromkeys(payload.ids))
+    codes = list(dict.fromkeys(payload.codes))
+    if dynamic_schema:
+        # One IN query on the read model; documents already carry the attribute values
+        products = get_product_documents(db, ids, codes)
+        by_id = {document["id"]: document for document in products}
+        id_by_code = {document["product_code"]: document["id"] for document in products}
+    else:
+        conditions = []
+        if ids:
+            conditions.append(Product.id.in_(ids))
+        if codes:
+            conditions.append(Product.product_code.in_(codes))
+        products = db.query(Product).filter(or_(*conditions)).all() if conditions else []
+        by_id = {product.id: ProductOut.model_validate(product) for product in products}
+        id_by_code = {product.product_code: product.id for product in products}
     
-    return ProductOutSchema(**response_data)
+    # A product asked for by both id and code is returned once
+    matched_ids = [product_id for product_id in ids if product_id in by_id]
+    matched_ids += [id_by_code[code] for code in codes if code in id_by_code]
+    items = [by_id[product_id] for product_id in dict.fromkeys(matched_ids)]
+    return ProductBatchGetResult(
+        size=len(items),
+        products=items,
+        missing_ids=[product_id for product_id in ids if product_id not in by_id],
+        missing_codes=[code for code in codes if code not in id_by_code]
+    )
 
 @router.get("/")
 def get_products(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page's next_cursor"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    order_by: str = Query("id", pattern="^(id|last_modified_date)$", description="Sort key: id or last_modified_date"),
     status: Optional[Status] = Query(None, description="Filter by status"),
+    include_total: bool = Query(False, description="Include a (possibly estimated) total count"),
+    facets: bool = Query(False, description="Include per-option counts for the attributes not filtered on"),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset pagination, ignored when a cursor is given"),
     dynamic_schema: bool = Query(True, description="Use dynamic schema with attribute fields"),
     db: Session = Depends(get_db)
 ):
-    """Get all products with their dynamic attributes"""
+    """Get products with their dynamic attributes, paginated by cursor.
+
+    Filter on attribute values with `attr.<attribute_code>=<option>` parameters,
+    e.g. `attr.network_type=5G&attr.hotspot=YES`; repeat a parameter to match any
+    of several options.
+    """
+    catalog = get_attribute_catalog(db)
+    try:
+        attribute_filters = parse_attribute_filters(request.query_params, catalog)
+    except AttributeResolutionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     query = db.query(Product)
     
     # Apply filters
     if status:
         query = query.filter(Product.status == status)
+    query = apply_attribute_filters(query, attribute_filters)
+    
+    if dynamic_schema:
+        # Load the attribute values of the whole page in one extra query
+        query = query.options(selectinload(Product.product_attribute_value_index))
+    
+    index = get_facet_index(db) if FACET_INDEX_ENABLED else None
+    candidates = index.matching(status, attribute_filters) if index is not None else None
+    
+    total, total_is_estimate = None, False
+    if include_total:
+        if candidates is not None:
+            total = candidates.bit_count()
+        else:
+            total, total_is_estimate = estimate_total(
+                db, query, Product, filtered=status is not None or bool(attribute_filters)
+            )
+    if facets:
+        if candidates is not None:
+            facet_result = index.facet_counts(candidates, catalog, attribute_filters)
+        else:
+            facet_result = facet_counts(db, query, catalog, attribute_filters)
+    else:
+        facet_result = None
+    
+    next_cursor = None
+    if candidates is not None and order_by == "id" and not (skip and not cursor):
+        # The index already holds the filtered ids in order: the page is a primary-key lookup
+        try:
+            after_id = decode_cursor(cursor, order_by)[0] if cursor else 0
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        page_ids = index.page_ids(candidates, after_id, limit + 1)
+        products = query.filter(Product.id.in_(page_ids[:limit])).order_by(Product.id).all() if page_ids else []
+        if len(page_ids) > limit:
+            next_cursor = encode_cursor(order_by, [page_ids[limit - 1]])
+    else:
+        # Keyset pagination: stable ordering and constant cost whatever the page depth
+        try:
+            page_query = apply_keyset(query, Product, order_by, cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if skip and not cursor:
+            page_query = page_query.offset(skip)
+        
+        # Fetch one extra row to know whether there is a next page
+        products = page_query.limit(limit + 1).all()
+        if len(products) > limit:
+            products = products[:limit]
+            next_cursor = next_cursor_for(products, order_by)
+    
+    # Validators from everything the body is built from: the page rows and their attribute
+    # values, the next-page marker, totals and facets, the query and the catalog fingerprint
+    # (attribute columns and option labels). No aggregate over the whole filtered set.
+    attribute_values = [
+        (value.product_id, value.attribute_id, value.attribute_option_id)
+        for product in products for value in product.product_attribute_value_index
+    ] if dynamic_schema else None
+    etag, last_modified = page_validators(
+        products,
+        extra=(attribute_values, next_cursor, total, total_is_estimate, facet_result, request.url.query, catalog.fingerprint)
+    )
+    not_modified = check_not_modified(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
     
-    # if dynamic_schema:
-    #     # Temporarily get all products with attributes until database is updated
-    #     query = query.join(ProductAttributeValueIndex).join(Attribute).join(AttributeGroupLink).join(AttributeGroup).filter(
-    #         AttributeGroup.group_name == AttributeGroupName.product
-    #     ).distinct()
-    #     # Load relationships for dynamic schema
-    #     query = query.options(
-    #         joinedload(Product.product_attribute_value_index)
-    #         .joinedload(ProductAttributeValueIndex.attribute)
-    #         .joinedload(Attribute.attribute_group_links)
-    #         .joinedload(AttributeGroupLink.attribute_group),
-    #         joinedload(Product.product_attribute_value_index)
-    #         .joinedload(ProductAttributeValueIndex.attribute_option)
-    # )
-    
-    products = query.offset(skip).limit(limit).all()
+    if FAST_JSON_RESPONSES:
+        # Fast path: plain dicts serialized straight to bytes, no per-row Pydantic model
+        if dynamic_schema:
+            items = [format_product_for_dynamic_schema(product, catalog) for product in products]
+        else:
+            items = [row_dict(product, ProductOut.model_fields) for product in products]
+        return FastJSONResponse({
+            "products": items,
+            "size": len(items),
+            "next_cursor": next_cursor,
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "facets": facet_result
+        }, headers=response.headers)
     
     if dynamic_schema:
         # Return with dynamic schema
-        attributes = get_product_attributes(db)
-        print(attributes)
-        ProductOutSchema = create_dynamic_product_out_schema(attributes)
-        return [ProductOutSchema(**format_product_for_dynamic_schema(product, attributes)) for product in products]
+        ProductOutSchema = create_dynamic_product_out_schema(catalog.attributes, catalog.fingerprint)
+        items = [ProductOutSchema(**format_product_for_dynamic_schema(product, catalog)) for product in products]
     else:
         # Return with static schema
-        return [ProductOut.model_validate(product) for product in products]
+        items = [ProductOut.model_validate(product) for product in products]
+    
+    return ProductList(
+        products=items,
+        size=len(items),
+        next_cursor=next_cursor,
+        total=total,
+        total_is_estimate=total_is_estimate,
+        facets=facet_result
+    )
+
+
+@router.get("/export")
+def export_products(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+    status: Optional[Status] = Query(None, description="Filter by status"),
+    batch_size: int = Query(1000, ge=100, le=10000, description="Rows fetched per server-side cursor batch"),
+    db: Session = Depends(get_db)
+):
+    """Stream the full product catalog with flattened attribute values"""
+    batches = iter_product_batches(status=status, batch_size=batch_size)
+    if format == "csv":
+        attribute_codes = [attr.attribute_code for attr in get_product_attributes(db)]
+        return StreamingResponse(
+            iter_products_csv(batches, attribute_codes),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="products.csv"'}
+        )
+    return StreamingResponse(iter_products_ndjson(batches), media_type="application/x-ndjson")
+
+@router.get("/search", response_model=ProductSearchResult)
+def search_products(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in product code, note or option labels"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    db: Session = Depends(get_db)
+):
+    """Search products by partial code, note text and attribute option labels (EN/VN).
 
+    Matching is case- and accent-insensitive ("sim du lich" finds "SIM du lịch")
+    and every word must match; results are ranked with exact and prefix code
+    matches first. Served from trigram indexes on the product documents.
+    """
+    documents = search_product_documents(db, q, limit)
+    return ProductSearchResult(query=q, size=len(documents), products=documents)
 
 @router.get("/{product_id}")
 def get_product(
     product_id: int, 
+    request: Request,
+    response: Response,
     dynamic_schema: bool = Query(True, description="Use dynamic schema with attribute fields"),
     db: Session = Depends(get_db)
 ):
     """Get a specific product by ID with its dynamic attributes"""
-    product = db.query(Product).options(
-        joinedload(Product.product_attribute_value_index)
-        .joinedload(ProductAttributeValueIndex.attribute),
-        joinedload(Product.product_attribute_value_index)
-        .joinedload(ProductAttributeValueIndex.attribute_option)
-    ).filter(Product.id == product_id).first()
+    if dynamic_schema:
+        # Served from the denormalized read model: a single primary-key lookup
+        document = get_product_document(db, product_id=product_id)
+        if document is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        not_modified = document_not_modified(request, response, document)
+        if not_modified:
+            return not_modified
+        return document
+    
+    product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    
-    if dynamic_schema:
-        # Return with dynamic schema showing attribute.* fields
-        attributes = get_product_attributes(db)
-        ProductOutSchema = create_dynamic_product_out_schema(attributes)
-        response_data = format_product_for_dynamic_schema(product, attributes)
-        
-        return ProductOutSchema(**response_data)
-    else:
-        # Return with static schema
-        return ProductOut.model_validate(product)
+    not_modified = check_not_modified(request, response, *row_validators(product))
+    if not_modified:
+        return not_modified
+    # Return with static schema
+    return ProductOut.model_validate(product)
 
 @router.get("/code/{product_code}")
 def get_product_by_code(
     product_code: str,
+    request: Request,
+    response: Response,
     dynamic_schema: bool = Query(True, description="Use dynamic schema with attribute fields"),
     db: Session = Depends(get_db)
 ):
     """Get a specific product by product code with its dynamic attributes"""
+    if dynamic_schema:
+        # Served from the denormalized read model: a single unique-index lookup
+        document = get_product_document(db, product_code=product_code)
+        if document is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        not_modified = document_not_modified(request, response, document)
+        if not_modified:
+            return not_modified
+        return document
+    
     product = db.query(Product).filter(Product.product_code == product_code).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    
-    if dynamic_schema:
-        # Return with dynamic schema showing attribute.* fields
-        attributes = get_product_attributes(db)
-        ProductOutSchema = create_dynamic_product_out_schema(attributes)
-        response_data = format_product_for_dynamic_schema(product, attributes)
-        return ProductOutSchema(**response_data)
-    else:
-        # Return with static schema
-        return ProductOut.model_validate(product)
+    not_modified = check_not_modified(request, response, *row_validators(product))
+    if not_modified:
+        return not_modified
+    # Return with static schema
+    return ProductOut.model_validate(product)
 
 @router.put("/{product_id}")
 def update_product(product_id: int, request_data: dict, db: Session = Depends(get_db)):
@@ -249,10 +468,11 @@ def update_product(product_id: int, request_data: dict, db: Session = Depends(ge
         raise HTTPException(status_code=404, detail="Product not found")
     
     # Get available attributes to validate against
-    attributes = get_product_attributes(db)
+    catalog = get_attribute_catalog(db)
+    attributes = catalog.attributes
     
     # Create dynamic schema and validate request
-    ProductUpdateSchema = create_dynamic_product_update_schema(attributes)
+    ProductUpdateSchema = create_dynamic_product_update_schema(attributes, catalog.fingerprint)
     
     try:
         validated_data = ProductUpdateSchema(**request_data)
@@ -276,65 +496,23 @@ def update_product(product_id: int, request_data: dict, db: Session = Depends(ge
     attribute_values = extract_attributes_from_request(request_data, attributes)
     
     if attribute_values:
-        # Remove existing attributes that are being updated
-        for attribute_code in attribute_values.keys():
-            attribute = db.query(Attribute).filter(Attribute.attribute_code == attribute_code).first()
-            if attribute:
-                db.query(ProductAttributeValueIndex).filter(
-                    ProductAttributeValueIndex.product_id == product_id,
-                    ProductAttributeValueIndex.attribute_id == attribute.id
-                ).delete()
+        try:
+            resolved_values = resolve_attribute_values(
+                load_attribute_option_lookup(db, attribute_values.keys()), attribute_values
+            )
+        except AttributeResolutionError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Add new attribute values
-        for attribute_code, option_value in attribute_values.items():
-            if option_value:  # Only process non-empty values
-                # Find the attribute
-                attribute = db.query(Attribute).filter(
-                    Attribute.attribute_code == attribute_code
-                ).first()
-                if not attribute:
-                    raise HTTPException(
-                        status_code=400, 
-                        detail=f"Attribute '{attribute_code}' not found in product group"
-                    )
-                
-                # Find the attribute option
-                attribute_option = None
-                if option_value.isdigit():
-                    attribute_option = db.query(AttributeOption).filter(
-                        AttributeOption.id == int(option_value),
-                        AttributeOption.attribute_code == attribute_code
-                    ).first()
-                
-                if not attribute_option:
-                    attribute_option = db.query(AttributeOption).filter(
-                        AttributeOption.attribute_code == attribute_code,
-                        (AttributeOption.attribute_option_en == option_value) |
-                        (AttributeOption.attribute_option_vn == option_value)
-                    ).first()
-                
-                if not attribute_option:
-                    raise HTTPException(
-                        status_code=400, 
-                        detail=f"Attribute option '{option_value}' not found for attribute '{attribute_code}'"
-                    )
-                
-                # Create the mapping
-                pavi = ProductAttributeValueIndex(
-                    product_id=db_product.id,
-                    attribute_id=attribute.id,
-                    attribute_option_id=attribute_option.id
-                )
-                db.add(pavi)
+        write_product_attribute_values(db, product_id, resolved_values, replace=True)
+        # Attribute values live in another table: bump the product so its ETag changes
+        db_product.last_modified_date = func.now()
     
+    # Keep the read model in the same transaction; it is also the response
+    documents = refresh_product_documents(db, [product_id], catalog)
     db.commit()
-    db.refresh(db_product)
-    
-    # Format response using dynamic schema
-    ProductOutSchema = create_dynamic_product_out_schema(attributes)
-    response_data = format_product_for_dynamic_schema(db_product, attributes)
+    facet_index.mark_stale()
     
-    return ProductOutSchema(**response_data)
+    return documents[0]
 
 @router.delete("/{product_id}")
 def delete_product(product_id: int, db: Session = Depends(get_db)):
@@ -344,5 +522,7 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Product not found")
     
     db_product.status = Status.DELETED
+    refresh_product_documents(db, [product_id])
     db.commit()
+    facet_index.mark_stale()
     return {"message": "Product deleted successfully"}
\ No newline at end of file
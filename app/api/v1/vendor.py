@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db.session import get_db
 from app.models.vendor import Vendor
 from app.schemas.vendor import VendorCreate, VendorUpdate, VendorOut
+from app.utils.conditional import check_not_modified, row_validators
+from app.utils.response_cache import cached_list_response, invalidate_reference_cache, reference_list
 
 router = APIRouter()
 
+@reference_list("vendors", List[VendorOut])
+def load_vendors(db: Session):
+    return db.query(Vendor).all()
+
 @router.get("/", response_model=List[VendorOut])
-def get_vendors(db: Session = Depends(get_db)):
+def get_vendors(request: Request, db: Session = Depends(get_db)):
     """Get all vendors"""
-    return db.query(Vendor).all()
+    return cached_list_response(request, "vendors", List[VendorOut], lambda: load_vendors(db))
 
 @router.post("/", response_model=VendorOut)
 def create_vendor(vendor: VendorCreate, db: Session = Depends(get_db)):
@@ -22,22 +28,29 @@ def create_vendor(vendor: VendorCreate, db: Session = Depends(get_db)):
     db.add(db_vendor)
     db.commit()
     db.refresh(db_vendor)
+    invalidate_reference_cache("vendors")
     return db_vendor
 
 @router.get("/{vendor_id}", response_model=VendorOut)
-def get_vendor(vendor_id: int, db: Session = Depends(get_db)):
+def get_vendor(vendor_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get a vendor by ID"""
     db_vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
     if not db_vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_vendor))
+    if not_modified:
+        return not_modified
     return db_vendor
 
 @router.get("/code/{vendor_code}", response_model=VendorOut)
-def get_vendor_by_code(vendor_code: str, db: Session = Depends(get_db)):
+def get_vendor_by_code(vendor_code: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get a vendor by code"""
     db_vendor = db.query(Vendor).filter(Vendor.vendor_code == vendor_code).first()
     if not db_vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
+    not_modified = check_not_modified(request, response, *row_validators(db_vendor))
+    if not_modified:
+        return not_modified
     return db_vendor
 
 @router.put("/{vendor_id}", response_model=VendorOut)
@@ -46,6 +59,15 @@ def update_vendor(vendor_id: int, vendor: VendorUpdate, db: Session = Depends(ge
     db_vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
     if not db_vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
-    db_vendor.vendor_code = vendor.vendor_code
-    db_vendor.code = vendor.code
-    db_vendor.vendor_name = vendor.vendor_name
+    
+    if vendor.vendor_code is not None:
+        db_vendor.vendor_code = vendor.vendor_code
+    if vendor.code is not None:
+        db_vendor.code = vendor.code
+    if vendor.vendor_name is not None:
+        db_vendor.vendor_name = vendor.vendor_name
+    
+    db.commit()
+    db.refresh(db_vendor)
+    invalidate_reference_cache("vendors")
+    return db_vendor
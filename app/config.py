@@ -0,0 +1,75 @@
+from dotenv import load_dotenv
+import os
+
+# Load the .env file from the working directory (no-op when it does not exist).
+# ENV_FILE points somewhere else, e.g. for a per-deployment file.
+load_dotenv(dotenv_path=os.getenv("ENV_FILE"))
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+# Database connection
+DB_HOST = os.getenv("DB_HOST")
+DB_PORT = os.getenv("DB_PORT")
+DB_NAME = os.getenv("DB_NAME")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+
+# DATABASE_URL overrides the DB_* parts (e.g. sqlite:///./local.db for local testing)
+DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Schema: startup only checks the database is at the latest Alembic revision.
+# DB_AUTO_MIGRATE runs `alembic upgrade head` first (local development).
+DB_AUTO_MIGRATE = _get_bool("DB_AUTO_MIGRATE", False)
+
+# Startup warm-up (mappers, pool connections, attribute catalog, reference caches);
+# /health/ready reports ready once it has finished
+STARTUP_WARMUP = _get_bool("STARTUP_WARMUP", True)
+
+# Connection pool (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle connections older than this many seconds (-1 = never)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _get_bool("DB_POOL_PRE_PING", True)
+# Connections opened during warm-up (defaults to the pool size)
+DB_POOL_WARMUP_CONNECTIONS = int(os.getenv("DB_POOL_WARMUP_CONNECTIONS", str(DB_POOL_SIZE)))
+# Log a warning when a request waits longer than this for a connection
+DB_POOL_SLOW_WAIT_MS = float(os.getenv("DB_POOL_SLOW_WAIT_MS", "100"))
+
+# Attribute catalog cache: the version counter handles invalidation inside this
+# process, the TTL bounds how stale another worker's copy can get.
+ATTRIBUTE_CATALOG_TTL_SECONDS = float(os.getenv("ATTRIBUTE_CATALOG_TTL_SECONDS", "300"))
+
+# Reference-data list responses (countries, vendors, ...): server-side cache TTL,
+# and how long clients may reuse a response before revalidating with its ETag
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+REFERENCE_CACHE_MAX_AGE = int(os.getenv("REFERENCE_CACHE_MAX_AGE", "60"))
+
+# Serialize list responses (products, attributes) from plain dicts with orjson
+# instead of building one Pydantic model per row
+FAST_JSON_RESPONSES = _get_bool("FAST_JSON_RESPONSES", False)
+
+# Optional in-process bitmap index of product attribute values for filtered id sets and
+# facet counts; synced from product.last_modified_date, fully rebuilt every REBUILD seconds
+FACET_INDEX_ENABLED = _get_bool("FACET_INDEX_ENABLED", False)
+FACET_INDEX_SYNC_SECONDS = float(os.getenv("FACET_INDEX_SYNC_SECONDS", "2"))
+FACET_INDEX_REBUILD_SECONDS = float(os.getenv("FACET_INDEX_REBUILD_SECONDS", "3600"))
+
+# Prometheus-style request/SQL metrics middleware and the /metrics endpoint
+METRICS_ENABLED = _get_bool("METRICS_ENABLED", True)
+
+# SQL debug mode: X-DB-Query-Count / X-DB-Time response headers, and a warning
+# when one request runs the same statement shape more than the threshold
+DB_QUERY_DEBUG = _get_bool("DB_QUERY_DEBUG", False)
+DB_REPEATED_QUERY_THRESHOLD = int(os.getenv("DB_REPEATED_QUERY_THRESHOLD", "5"))
+
+# Async mode: serve the routers on an AsyncSession (asyncpg) instead of a threadpool
+DB_ASYNC = _get_bool("DB_ASYNC", False)
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
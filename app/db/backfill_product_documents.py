@@ -0,0 +1,60 @@
+"""Build the product read model for products that do not have a document yet.
+
+    python -m app.db.backfill_product_documents [--batch-size 500] [--all]
+
+By default only products without a document, or whose document was built with
+an older attribute catalog, are processed; --all rebuilds every document.
+"""
+import argparse
+from sqlalchemy import or_
+from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.models.product import Product
+from app.models.product_document import ProductDocument
+from app.utils.attribute_catalog import load_attribute_catalog
+from app.utils.product_documents import refresh_product_documents
+
+
+def backfill_product_documents(batch_size: int = 500, rebuild_all: bool = False) -> int:
+    """Rebuild documents in keyset-ordered batches, one transaction per batch"""
+    db = SessionLocal()
+    try:
+        catalog = load_attribute_catalog(db, version=0)
+        query = db.query(Product.id).outerjoin(ProductDocument, ProductDocument.product_id == Product.id)
+        if not rebuild_all:
+            query = query.filter(or_(
+                ProductDocument.product_id.is_(None),
+                ProductDocument.catalog_fingerprint != catalog.fingerprint
+            ))
+
+        processed = 0
+        last_id = 0
+        while True:
+            product_ids = [
+                product_id for (product_id,) in
+                query.filter(Product.id > last_id).order_by(Product.id).limit(batch_size).all()
+            ]
+            if not product_ids:
+                break
+            refresh_product_documents(db, product_ids, catalog)
+            db.commit()
+            # Drop the loaded products so memory stays flat across batches
+            db.expunge_all()
+            processed += len(product_ids)
+            last_id = product_ids[-1]
+            print(f"Backfilled {processed} product documents (last id {last_id})")
+        return processed
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the product_document read model")
+    parser.add_argument("--batch-size", type=int, default=500, help="Products rebuilt per transaction")
+    parser.add_argument("--all", action="store_true", help="Rebuild every document, not only missing or stale ones")
+    args = parser.parse_args()
+
+    # Make sure the product_document table exists
+    init_db()
+    total = backfill_product_documents(batch_size=args.batch_size, rebuild_all=args.all)
+    print(f"Done: {total} product documents")
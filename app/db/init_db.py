@@ -1,7 +1,10 @@
+from app.config import DB_AUTO_MIGRATE
 from app.db.session import engine
-from app.db.base import Base
-from app.models import user, product, vendor, operator, country, attribute, attribute_option, product_attribute_value_index, attribute_group # import các models để chúng được "đăng ký"
+from app.db.migrations import check_schema_revision, upgrade_database
+from app.models import user, product, vendor, operator, country, attribute, attribute_option, product_attribute_value_index, attribute_group, product_document # import các models để chúng được "đăng ký"
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
-    
\ No newline at end of file
+    """Verify the database is at the latest migration; with DB_AUTO_MIGRATE, migrate it first"""
+    if DB_AUTO_MIGRATE:
+        upgrade_database(engine)
+    check_schema_revision(engine)
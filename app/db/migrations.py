@@ -0,0 +1,55 @@
+"""Schema management through the Alembic migration history in alembic/."""
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+class SchemaRevisionError(RuntimeError):
+    pass
+
+
+def alembic_config(connection=None) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(engine: Engine):
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def check_schema_revision(engine: Engine):
+    """Fail fast when the database is not at the latest migration; a single-row lookup"""
+    current, head = current_revision(engine), head_revision()
+    if current != head:
+        raise SchemaRevisionError(
+            f"Database schema is at revision {current or '(none)'}, the code expects {head}. "
+            "Run `alembic upgrade head` (or set DB_AUTO_MIGRATE=true for local development)."
+        )
+
+
+def upgrade_database(engine: Engine, revision: str = "head"):
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), revision)
+
+
+def drop_database_schema(engine: Engine):
+    """Drop every table including the migration history, for throwaway databases (benchmarks, generators)"""
+    from app.db.base import Base
+    import app.models  # noqa: F401
+    Base.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.config import DB_POOL_SLOW_WAIT_MS
+
+logger = logging.getLogger("app.db.pool")
+
+
+class PoolStats:
+    """Counters for one connection pool, updated from pool events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.exhausted = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.slow_waits = 0
+
+    def record_wait(self, wait_ms: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            if wait_ms >= DB_POOL_SLOW_WAIT_MS:
+                self.slow_waits += 1
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "exhausted": self.exhausted,
+                "slow_waits": self.slow_waits,
+                "wait_avg_ms": round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+            }
+
+
+class _TimedCheckoutMixin:
+    """Measures how long each checkout waits for a free connection.
+
+    Wraps the public Pool.connect(), which every engine checkout goes through;
+    occupancy comes from checkedout()/size() and the max_overflow the pool was
+    created with.
+    """
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        self.max_overflow = max_overflow
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def connect(self):
+        if self.max_overflow > -1 and self.checkedout() >= self.size() + self.max_overflow:
+            self.stats.increment("exhausted")
+            logger.warning(
+                "Connection pool exhausted: %s checked out (size=%s, max_overflow=%s)",
+                self.checkedout(), self.size(), self.max_overflow
+            )
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.stats.increment("timeouts")
+            logger.error("Timed out waiting %.1fs for a database connection", self.timeout())
+            raise
+        finally:
+            wait_ms = (time.perf_counter() - start) * 1000
+            self.stats.record_wait(wait_ms)
+            if wait_ms >= DB_POOL_SLOW_WAIT_MS:
+                logger.warning("Waited %.1f ms for a database connection", wait_ms)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine):
+    """Count new and invalidated connections for the engine's pool"""
+    pool = engine.pool
+    if not hasattr(pool, "stats"):
+        pool.stats = PoolStats()
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        engine.pool.stats.increment("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        engine.pool.stats.increment("invalidations")
+        logger.warning("Database connection invalidated: %s", exception)
+
+
+def pool_status(engine: Engine) -> dict:
+    """Live pool occupancy plus the counters collected since startup"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "max_overflow": getattr(pool, "max_overflow", None),
+            "timeout_seconds": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.as_dict())
+    return status
@@ -0,0 +1,139 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \((?!\s*SELECT\b)[^()]*\)", re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL with literals and IN lists collapsed, so repeated lookups compare equal"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _IN_LIST.sub("IN (...)", shape)
+    return _LITERAL.sub("?", shape)
+
+
+class QueryStats:
+    """SQL statements executed on behalf of one request (or one tracked block)"""
+
+    __slots__ = ("count", "total_seconds", "shapes")
+
+    def __init__(self, track_shapes: bool = False):
+        self.count = 0
+        self.total_seconds = 0.0
+        # Statement shape -> executions; only kept in debug mode, it costs a regex per statement
+        self.shapes = Counter() if track_shapes else None
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        if self.shapes is not None:
+            self.shapes[statement_shape(statement)] += 1
+
+    def track_shapes(self):
+        if self.shapes is None:
+            self.shapes = Counter()
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times: likely N+1 patterns"""
+        if self.shapes is None:
+            return []
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+# Set by the metrics middleware for the duration of a request. The object is
+# mutable so statements run in the threadpool (which gets a copy of the
+# context) are still added to the request's stats.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+# Collectors that see every statement in the process, whatever the context (query_budget)
+_global_collectors: list[QueryStats] = []
+
+
+@contextmanager
+def track_queries(stats: Optional[QueryStats] = None):
+    """Collect the statements executed inside the block into `stats`"""
+    stats = stats if stats is not None else QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+@contextmanager
+def collect_queries(track_shapes: bool = False):
+    """Collect every statement executed in the process while the block runs.
+
+    Unlike track_queries this does not depend on the context, so requests served
+    on TestClient's event loop thread are counted too.
+    """
+    stats = QueryStats(track_shapes=track_shapes)
+    _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_collectors.remove(stats)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None):
+    """Fail when the block runs more than `max_queries` statements.
+
+    Meant for tests, e.g.
+
+        with query_budget(3):
+            client.get("/products/1")
+
+    Statements are collected process-wide (see collect_queries). With
+    `max_repeats`, the same statement shape may run at most that many times
+    (catches N+1 loops).
+    """
+    with collect_queries(track_shapes=True) as stats:
+        yield stats
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} statements executed, budget is {max_queries}")
+    if max_repeats is not None:
+        problems.extend(f"{count}x {shape}" for shape, count in stats.repeated(max_repeats))
+    if problems:
+        shapes = "\n".join(f"  {count}x {shape}" for shape, count in stats.shapes.most_common())
+        raise AssertionError("Query budget exceeded: " + "; ".join(problems) + "\n" + shapes)
+
+
+def instrument_queries(engine: Engine):
+    """Time every statement executed on the engine and add it to the current QueryStats"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_query_stats.get() is not None or _global_collectors:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = current_query_stats.get()
+        if stats is None and not _global_collectors:
+            return
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        for collector in _global_collectors:
+            collector.record(statement, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start"):
+            connection.info["query_start"].pop()
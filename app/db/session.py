@@ -1,29 +1,37 @@
-from dotenv import load_dotenv
-import os
-
-# Explicitly load the .env file from the app directory
-load_dotenv(dotenv_path="D:/product_mana/backend_pro/app/.env")
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from app.config import (
+    DATABASE_URL, ASYNC_DATABASE_URL, DB_ASYNC,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+)
+from app.db.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
+from app.db.query_stats import instrument_queries
 
-# Fetch environment variables
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
+if not DATABASE_URL:
+    raise ValueError("DATABASE_URL is not set")
 
 
-# Construct the database URL
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+def engine_options(url: str, poolclass) -> dict:
+    """Pool settings from the environment; SQLite keeps SQLAlchemy's own pool choice"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL is not set")
 
 # SQLAlchemy engine setup
-from sqlalchemy import create_engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, InstrumentedQueuePool))
+instrument_engine(engine)
+instrument_queries(engine)
 
 # Session setup
-from sqlalchemy.orm import sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -32,3 +40,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Optional async engine (DB_ASYNC=true). Routers then await the database instead of
+# holding a threadpool slot for the whole request.
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+async_engine = None
+if DB_ASYNC:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool))
+    instrument_engine(async_engine.sync_engine)
+    instrument_queries(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, class_=AsyncSession)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,15 +1,24 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.api.v1 import user, product, vendor, operator, country, attribute, attribute_option, attribute_group
-from app.db.init_db import init_db
+from app.api.v1 import user, product, vendor, operator, country, attribute, attribute_option, attribute_group, internal, metrics, health
+from app.config import DB_ASYNC, DB_QUERY_DEBUG, METRICS_ENABLED
+from app.utils.async_routes import async_router
+from app.utils.metrics import MetricsMiddleware
+from app.utils.query_debug import QueryDebugMiddleware
+from app.utils.warmup import startup_state, warm_up
 from fastapi.middleware.cors import CORSMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    init_db()
+    # Startup: the schema check and warm-up run (and retry) in the background while
+    # /health/live already answers and /health/ready reports 503
+    warmup_task = asyncio.create_task(warm_up())
     yield
-    # Shutdown cleanup (if needed)
+    # Shutdown: stop advertising readiness so the load balancer drains this worker
+    startup_state.ready = False
+    if not warmup_task.done():
+        warmup_task.cancel()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -21,11 +30,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(user.router, prefix="/users", tags=["users"])
-app.include_router(product.router, prefix="/products", tags=["products"])
-app.include_router(vendor.router, prefix="/vendors", tags=["vendors"])
-app.include_router(operator.router, prefix="/operators", tags=["operators"])
-app.include_router(country.router, prefix="/countries", tags=["countries"])
-app.include_router(attribute.router, prefix="/attributes", tags=["attributes"])
-app.include_router(attribute_option.router, prefix="/attribute_options", tags=["attribute_options"])
-app.include_router(attribute_group.router, prefix="/attribute_groups", tags=["attribute_groups"])
\ No newline at end of file
+if DB_QUERY_DEBUG:
+    # Per-request SQL count/time headers and N+1 warnings (added first: runs inside the metrics middleware)
+    app.add_middleware(QueryDebugMiddleware)
+
+if METRICS_ENABLED:
+    # Per-route latency, response size and SQL statements, exposed on /metrics
+    app.add_middleware(MetricsMiddleware)
+
+# With DB_ASYNC=true the same handlers are served as async endpoints on an AsyncSession
+def api_router(router):
+    return async_router(router) if DB_ASYNC else router
+
+app.include_router(api_router(user.router), prefix="/users", tags=["users"])
+app.include_router(api_router(product.router), prefix="/products", tags=["products"])
+app.include_router(api_router(vendor.router), prefix="/vendors", tags=["vendors"])
+app.include_router(api_router(operator.router), prefix="/operators", tags=["operators"])
+app.include_router(api_router(country.router), prefix="/countries", tags=["countries"])
+app.include_router(api_router(attribute.router), prefix="/attributes", tags=["attributes"])
+app.include_router(api_router(attribute_option.router), prefix="/attribute_options", tags=["attribute_options"])
+app.include_router(api_router(attribute_group.router), prefix="/attribute_groups", tags=["attribute_groups"])
+app.include_router(internal.router, prefix="/internal", tags=["internal"])
+app.include_router(health.router, prefix="/health", tags=["health"])
+if METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["metrics"])
\ No newline at end of file
@@ -8,6 +8,7 @@ from .attribute_option import AttributeOption
 from .product_attribute_value_index import ProductAttributeValueIndex
 from .attribute_group import AttributeGroup
 from .attribute_group_link import AttributeGroupLink
+from .product_document import ProductDocument
 # from .item_attribute_value_index import ItemAttributeValueIndex
 
-__all__ = ["User", "Product", "Vendor", "Operator", "Country", "Attribute", "AttributeOption", "ProductAttributeValueIndex", "AttributeGroup", "AttributeGroupLink"]
\ No newline at end of file
+__all__ = ["User", "Product", "Vendor", "Operator", "Country", "Attribute", "AttributeOption", "ProductAttributeValueIndex", "AttributeGroup", "AttributeGroupLink", "ProductDocument"]
\ No newline at end of file
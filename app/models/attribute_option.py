@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey
+from sqlalchemy import Column, Integer, Text, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from app.db.base import Base
@@ -18,6 +18,11 @@ class AttributeOption(Base):
     date_created = Column(TIMESTAMP(timezone=True), server_default=func.now())
     last_modified_date = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # One option per label within an attribute; conflict target of the bulk upsert
+    __table_args__ = (
+        UniqueConstraint('attribute_code', 'attribute_option_en', name='uq_attribute_option_code_en'),
+    )
+
     # Relationships
     attribute = relationship("Attribute", foreign_keys=[attribute_code], back_populates="attribute_options")
     product_attribute_value_index = relationship("ProductAttributeValueIndex", back_populates="attribute_option")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, Boolean, Text
+from sqlalchemy import Column, Integer, String, Enum, Boolean, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from app.db.base import Base
@@ -55,7 +55,11 @@ class Product(Base):
     date_created = Column(TIMESTAMP(timezone=True), server_default=func.now())
     last_modified_date = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
-
+    __table_args__ = (
+        # Keyset pages of GET /products filtered by status, or ordered by last_modified_date
+        Index('ix_product_status_id', 'status', 'id'),
+        Index('ix_product_last_modified_date_id', 'last_modified_date', 'id'),
+    )
 
     #Relationships to kyc table
     # kyc = relationship("KYC", foreign_keys=[kyc_code], back_populates="products")
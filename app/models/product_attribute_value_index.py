@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from app.db.base import Base
@@ -8,15 +8,22 @@ from sqlalchemy.orm import relationship
 class ProductAttributeValueIndex(Base):
     __tablename__ = "product_attribute_value_index"   
 
-    id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, ForeignKey("product.id"), nullable=False, index=True)
-    attribute_id = Column(Integer, ForeignKey("attribute.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    # product_id / attribute_id are covered by the composite indexes below
+    product_id = Column(Integer, ForeignKey("product.id"), nullable=False)
+    attribute_id = Column(Integer, ForeignKey("attribute.id"), nullable=False)
     attribute_option_id = Column(Integer, ForeignKey("attribute_option.id"), nullable=False, index=True)
     date_created = Column(TIMESTAMP(timezone=True), server_default=func.now())
     last_modified_date = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Ensure one attribute per product (prevent duplicates)
-    __table_args__ = (UniqueConstraint('product_id', 'attribute_id', name='uq_product_attribute'),)
+    __table_args__ = (
+        UniqueConstraint('product_id', 'attribute_id', name='uq_product_attribute'),
+        # Facet filters/counts: "all products with option X of attribute Y" as an index-only scan
+        Index('ix_pavi_attribute_option_product', 'attribute_id', 'attribute_option_id', 'product_id'),
+        # "All attributes of product P" (page loads, document rebuilds) as an index-only scan
+        Index('ix_pavi_product_attribute_option', 'product_id', 'attribute_id', 'attribute_option_id'),
+    )
 
     # Relationships
     product = relationship("Product", foreign_keys=[product_id], back_populates="product_attribute_value_index")
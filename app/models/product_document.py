@@ -0,0 +1,66 @@
+from sqlalchemy import Column, DDL, Index, Integer, Text, JSON, ForeignKey, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from sqlalchemy.sql.sqltypes import TIMESTAMP
+from app.db.base import Base
+from sqlalchemy.orm import relationship
+
+
+class ProductDocument(Base):
+    """Denormalized read model: one JSON document per product.
+
+    Holds the base product fields plus resolved attribute values in English
+    and Vietnamese, so single-product reads are a primary-key fetch with no
+    joins. Rebuilt in the same transaction as every product write. search_text
+    is the accent-folded text that GET /products/search matches against.
+    """
+    __tablename__ = "product_document"
+
+    product_id = Column(Integer, ForeignKey("product.id", ondelete="CASCADE"), primary_key=True)
+    product_code = Column(Text, unique=True, nullable=False, index=True)
+    document = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    # Fingerprint of the attribute catalog the document was built with
+    catalog_fingerprint = Column(Text, nullable=False)
+    # Lowercased, accent-folded product code, note and option labels (EN + VN)
+    search_text = Column(Text, nullable=False, server_default="")
+    date_created = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    last_modified_date = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    product = relationship("Product", foreign_keys=[product_id])
+
+    __table_args__ = (
+        # Substring and fuzzy search on PostgreSQL: LIKE '%term%' and word_similarity via pg_trgm
+        Index(
+            "ix_product_document_search_trgm", "search_text",
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    def __repr__(self):
+        return f"<ProductDocument(product_id={self.product_id}, product_code='{self.product_code}')>"
+
+
+# pg_trgm has to exist before the GIN index above is created
+event.listen(
+    ProductDocument.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+# SQLite (local testing): an FTS5 trigram index over search_text, kept in sync by triggers
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5("
+    "search_text, content='product_document', content_rowid='product_id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS product_search_ai AFTER INSERT ON product_document BEGIN "
+    "INSERT INTO product_search(rowid, search_text) VALUES (new.product_id, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS product_search_ad AFTER DELETE ON product_document BEGIN "
+    "INSERT INTO product_search(product_search, rowid, search_text) VALUES ('delete', old.product_id, old.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS product_search_au AFTER UPDATE ON product_document BEGIN "
+    "INSERT INTO product_search(product_search, rowid, search_text) VALUES ('delete', old.product_id, old.search_text); "
+    "INSERT INTO product_search(rowid, search_text) VALUES (new.product_id, new.search_text); END",
+]
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(ProductDocument.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    ProductDocument.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS product_search").execute_if(dialect="sqlite")
+)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class AttributeOptionBase(BaseModel):
@@ -26,3 +26,16 @@ class AttributeOptionOut(AttributeOptionBase):
     last_modified_date: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+# Bulk upsert: options are matched on (attribute_code, attribute_option_en)
+class AttributeOptionBulkItem(BaseModel):
+    attribute_code: str
+    attribute_option_en: str
+    attribute_option_vn: Optional[str] = None
+
+class AttributeOptionBulkUpsert(BaseModel):
+    options: List[AttributeOptionBulkItem]
+
+class AttributeOptionBulkResult(BaseModel):
+    total: int
+    ids: List[int]
@@ -1,7 +1,11 @@
-from pydantic import BaseModel, ConfigDict, Field, create_model
-from typing import Optional, Dict, Any, Type
+import hashlib
+import json
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, StringConstraints, create_model
+from typing import Optional, Dict, Any, Type, Annotated
 from datetime import datetime
 from app.utils.enums.status import Status as ProductStatus
+from app.models.attribute import AttributeType
+from app.utils.attribute_resolver import AttributeOptionLookup
 
 # Base Product Schema (only core fields)
 class ProductBase(BaseModel):
@@ -20,12 +24,15 @@ class ProductOut(ProductBase):
 
     model_config = ConfigDict(from_attributes=True)
 
-# Product List Response Schema
+# Product List Response Schema (cursor paginated)
 class ProductList(BaseModel):
-    products: list[ProductOut]
-    total: int
-    page: int
+    products: list[Any]
     size: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    # {attribute_code: [{id, attribute_option_en, attribute_option_vn, count}, ...]}
+    facets: Optional[Dict[str, list[Dict[str, Any]]]] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -43,9 +50,119 @@ class AvailableAttribute(BaseModel):
 class AvailableAttributesResponse(BaseModel):
     attributes: list[AvailableAttribute]
 
-# Dynamic schema creation functions
-def create_dynamic_product_create_schema(attributes: list) -> Type[BaseModel]:
-    """Create a dynamic ProductCreate schema with nested attribute object"""
+# Bulk import report (one entry per created or rejected row)
+class ProductBulkCreated(BaseModel):
+    row: int
+    id: int
+    product_code: str
+
+class ProductBulkError(BaseModel):
+    row: int
+    product_code: Optional[str] = None
+    detail: str
+
+class ProductBulkResult(BaseModel):
+    total: int
+    created: int
+    failed: int
+    products: list[ProductBulkCreated] = []
+    errors: list[ProductBulkError] = []
+
+# Search results are product documents (dynamic schema), best match first
+class ProductSearchResult(BaseModel):
+    query: str
+    size: int
+    products: list[dict[str, Any]]
+
+# Batch lookup by ids and/or product codes (at most BATCH_GET_MAX_KEYS of each)
+BATCH_GET_MAX_KEYS = 1000
+
+class ProductBatchGet(BaseModel):
+    ids: list[int] = Field(default_factory=list, max_length=BATCH_GET_MAX_KEYS)
+    codes: list[str] = Field(default_factory=list, max_length=BATCH_GET_MAX_KEYS)
+
+class ProductBatchGetResult(BaseModel):
+    size: int
+    products: list[Any]
+    missing_ids: list[int] = []
+    missing_codes: list[str] = []
+
+# Bulk status change: every given filter must match; products already in the target status are skipped
+BULK_STATUS_MAX_IDS = 10000
+
+class ProductBulkStatusUpdate(BaseModel):
+    status: ProductStatus
+    ids: Optional[list[int]] = Field(None, max_length=BULK_STATUS_MAX_IDS)
+    vendor_code: Optional[str] = None
+    operator_code: Optional[str] = None
+    supported_countries: Optional[str] = None
+    current_status: Optional[ProductStatus] = None
+
+class ProductBulkStatusResult(BaseModel):
+    status: ProductStatus
+    updated: int
+    ids: list[int]
+
+# Dynamic schema creation functions.
+# Building a model with create_model compiles its validator and serializer, which
+# costs milliseconds, so generated models are memoized per attribute catalog
+# fingerprint and only rebuilt when attributes or their options change.
+_SCHEMA_CACHE_SIZE = 16
+_schema_cache: Dict[tuple, Type[BaseModel]] = {}
+
+# Number attributes accept integers or decimals (or "" to clear the value)
+NUMBER_PATTERN = r"^(-?\d+(\.\d+)?)?$"
+
+def attributes_fingerprint(attributes: list) -> str:
+    """Stable hash of attribute codes, types and options"""
+    payload = [
+        [attr.attribute_code, attr.type_attribute,
+         [[opt["id"], opt["attribute_option_en"], opt["attribute_option_vn"]] for opt in attr.options]]
+        for attr in attributes
+    ]
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+def _memoized_schema(kind: str, attributes: list, fingerprint: Optional[str], build) -> Type[BaseModel]:
+    key = (kind, fingerprint or attributes_fingerprint(attributes))
+    model = _schema_cache.get(key)
+    if model is None:
+        if len(_schema_cache) >= _SCHEMA_CACHE_SIZE:
+            _schema_cache.clear()
+        model = _schema_cache[key] = build(attributes)
+    return model
+
+def _option_validator(attribute_code: str, lookup: AttributeOptionLookup):
+    def validate(value: str) -> str:
+        if value and lookup.find(value) is None:
+            raise ValueError(f"unknown option for {attribute_code}")
+        return value
+    return validate
+
+def _attribute_value_type(attr):
+    """Validation type for one attribute value in create/update requests"""
+    if attr.type_attribute == AttributeType.select.value:
+        # Options may be given by id or by English/Vietnamese text; "" clears the value. Checked
+        # with the same lookup the resolver uses, so errors stay short however many options exist
+        lookup = AttributeOptionLookup(None)
+        for opt in attr.options:
+            lookup.add_option(opt["id"], opt["attribute_option_en"], opt["attribute_option_vn"])
+        return Optional[Annotated[str, AfterValidator(_option_validator(attr.attribute_code, lookup))]]
+    if attr.type_attribute == AttributeType.number.value:
+        return Optional[Annotated[str, StringConstraints(pattern=NUMBER_PATTERN)]]
+    return Optional[str]
+
+def _create_attribute_values_model(name: str, attributes: list) -> Type[BaseModel]:
+    """Nested model with one typed, optional field per attribute code"""
+    # Attribute codes are used as aliases so any code is valid, even one that is
+    # not a Python identifier or clashes with a BaseModel attribute
+    fields = {
+        f"attribute_{index}": (_attribute_value_type(attr), Field(None, alias=attr.attribute_code))
+        for index, attr in enumerate(attributes)
+    }
+    return create_model(name, __config__=ConfigDict(extra="forbid"), **fields)
+
+def _build_product_create_schema(attributes: list) -> Type[BaseModel]:
+    ProductCreateAttributes = _create_attribute_values_model('ProductCreateAttributes', attributes)
     
     # Start with base fields
     fields = {
@@ -55,13 +172,13 @@ def create_dynamic_product_create_schema(attributes: list) -> Type[BaseModel]:
         'operator_code': (str, ...),
         'supported_countries': (str, ...),
         'note': (Optional[str], None),
-        'attribute': (Optional[Dict[str, str]], Field(default_factory=dict, description="Dynamic attributes"))
+        'attribute': (Optional[ProductCreateAttributes], Field(None, description="Dynamic attributes"))
     }
     
     return create_model('ProductCreate', **fields, __base__=BaseModel)
 
-def create_dynamic_product_update_schema(attributes: list) -> Type[BaseModel]:
-    """Create a dynamic ProductUpdate schema with nested attribute object"""
+def _build_product_update_schema(attributes: list) -> Type[BaseModel]:
+    ProductUpdateAttributes = _create_attribute_values_model('ProductUpdateAttributes', attributes)
     
     # Start with base fields (all optional for updates)
     fields = {
@@ -71,14 +188,12 @@ def create_dynamic_product_update_schema(attributes: list) -> Type[BaseModel]:
         'operator_code': (Optional[str], None),
         'supported_countries': (Optional[str], None),
         'note': (Optional[str], None),
-        'attribute': (Optional[Dict[str, str]], Field(default_factory=dict, description="Dynamic attributes"))
+        'attribute': (Optional[ProductUpdateAttributes], Field(None, description="Dynamic attributes"))
     }
     
     return create_model('ProductUpdate', **fields, __base__=BaseModel)
 
-def create_dynamic_product_out_schema(attributes: list) -> Type[BaseModel]:
-    """Create a dynamic ProductOut schema with nested attribute object"""
-    
+def _build_product_out_schema(attributes: list) -> Type[BaseModel]:
     # Start with base fields
     fields = {
         'id': (int, ...),
@@ -90,17 +205,32 @@ def create_dynamic_product_out_schema(attributes: list) -> Type[BaseModel]:
         'note': (Optional[str], None),
         'date_created': (datetime, ...),
         'last_modified_date': (datetime, ...),
-        'attribute': (Optional[Dict[str, str]], Field(default_factory=dict, description="Dynamic attributes"))
+        'attribute': (Optional[Dict[str, Optional[str]]], Field(default_factory=dict, description="Dynamic attributes")),
+        'attribute_vn': (Optional[Dict[str, Optional[str]]], Field(default_factory=dict, description="Dynamic attributes (Vietnamese)"))
     }
     
-    DynamicProductOut = create_model('DynamicProductOut', **fields, __base__=BaseModel)
-    DynamicProductOut.model_config = ConfigDict(from_attributes=True)
-    
-    return DynamicProductOut
+    return create_model('DynamicProductOut', **fields, __config__=ConfigDict(from_attributes=True))
+
+def create_dynamic_product_create_schema(attributes: list, fingerprint: Optional[str] = None) -> Type[BaseModel]:
+    """Create (or reuse) a dynamic ProductCreate schema with typed attribute fields"""
+    return _memoized_schema('create', attributes, fingerprint, _build_product_create_schema)
+
+def create_dynamic_product_update_schema(attributes: list, fingerprint: Optional[str] = None) -> Type[BaseModel]:
+    """Create (or reuse) a dynamic ProductUpdate schema with typed attribute fields"""
+    return _memoized_schema('update', attributes, fingerprint, _build_product_update_schema)
+
+def create_dynamic_product_out_schema(attributes: list, fingerprint: Optional[str] = None) -> Type[BaseModel]:
+    """Create (or reuse) a dynamic ProductOut schema with nested attribute object"""
+    return _memoized_schema('out', attributes, fingerprint, _build_product_out_schema)
 
 # Helper function to convert product data to match dynamic schema
-def format_product_for_dynamic_schema(product, attributes: list) -> dict:
-    """Format product data to match the dynamic schema with nested attribute object"""
+def format_product_for_dynamic_schema(product, catalog) -> dict:
+    """Format product data to match the dynamic schema with nested attribute object.
+
+    `catalog` is the cached AttributeCatalog; option text is resolved from it so
+    only `product.product_attribute_value_index` needs to be loaded (ideally
+    with selectinload for a whole page at once).
+    """
     
     # Start with base product data
     result = {
@@ -113,12 +243,25 @@ def format_product_for_dynamic_schema(product, attributes: list) -> dict:
         'note': product.note,
         'date_created': product.date_created,
         'last_modified_date': product.last_modified_date,
-        'attribute': {}
+        'attribute': {attr.attribute_code: None for attr in catalog.attributes},
+        'attribute_vn': {attr.attribute_code: None for attr in catalog.attributes}
     }
     
-    # Add attributes to nested object
-    for pavi in attributes:
-        result['attribute'][pavi.attribute_code] = pavi.attribute_code
+    # Add the product's actual values to the nested object
+    for pavi in product.product_attribute_value_index:
+        attribute_code = catalog.attribute_codes.get(pavi.attribute_id)
+        if attribute_code is None:
+            # Not an attribute of the 'product' group
+            continue
+        option = catalog.options_by_id.get(pavi.attribute_option_id)
+        if option is None:
+            # Fall back to the database when the option is newer than the cached catalog
+            option = {
+                "attribute_option_en": pavi.attribute_option.attribute_option_en,
+                "attribute_option_vn": pavi.attribute_option.attribute_option_vn
+            }
+        result['attribute'][attribute_code] = option["attribute_option_en"]
+        result['attribute_vn'][attribute_code] = option["attribute_option_vn"]
     
     return result
 
@@ -0,0 +1,75 @@
+import functools
+import inspect
+from typing import Optional
+from fastapi import APIRouter, Depends, Response
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_async_db
+
+
+def _db_parameter(endpoint) -> Optional[str]:
+    for name, parameter in inspect.signature(endpoint).parameters.items():
+        if getattr(parameter.default, "dependency", None) is get_db:
+            return name
+    return None
+
+
+def _make_async_endpoint(route: APIRoute, db_name: str):
+    endpoint = route.endpoint
+    response_adapter = TypeAdapter(route.response_model) if route.response_model is not None else None
+
+    def call_sync(session, kwargs):
+        result = endpoint(**kwargs, **{db_name: session})
+        # Serialize ORM results while still inside run_sync, where lazy loads are allowed
+        if response_adapter is not None and not isinstance(result, Response):
+            result = response_adapter.validate_python(result, from_attributes=True)
+        return result
+
+    @functools.wraps(endpoint)
+    async def async_endpoint(**kwargs):
+        db: AsyncSession = kwargs.pop(db_name)
+        # run_sync runs the unchanged handler on the AsyncSession's connection: its
+        # queries are awaited on the event loop rather than blocking a worker thread
+        return await db.run_sync(call_sync, kwargs)
+
+    signature = inspect.signature(endpoint)
+    async_endpoint.__signature__ = signature.replace(parameters=[
+        parameter.replace(default=Depends(get_async_db), annotation=AsyncSession) if name == db_name else parameter
+        for name, parameter in signature.parameters.items()
+    ])
+    return async_endpoint
+
+
+def async_router(router: APIRouter) -> APIRouter:
+    """Build an async twin of a sync router.
+
+    Every `def` endpoint that depends on `get_db` becomes an `async def` endpoint
+    on an AsyncSession; endpoints that are already async, or do not use the
+    database, are kept as they are.
+    """
+    new_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            new_router.routes.append(route)
+            continue
+
+        db_name = _db_parameter(route.endpoint)
+        endpoint = route.endpoint
+        if db_name is not None and not inspect.iscoroutinefunction(endpoint):
+            endpoint = _make_async_endpoint(route, db_name)
+
+        new_router.add_api_route(
+            route.path,
+            endpoint,
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            summary=route.summary,
+            description=route.description,
+            deprecated=route.deprecated,
+            name=route.name,
+            response_class=route.response_class,
+            include_in_schema=route.include_in_schema,
+        )
+    return new_router
@@ -0,0 +1,187 @@
+import threading
+import time
+from typing import Optional
+from sqlalchemy.orm import Session, joinedload
+from app.config import ATTRIBUTE_CATALOG_TTL_SECONDS
+from app.models.attribute import Attribute
+from app.models.attribute_group import AttributeGroup, AttributeGroupName
+from app.models.attribute_group_link import AttributeGroupLink
+from app.schemas.product import AvailableAttribute, attributes_fingerprint
+from app.utils.attribute_resolver import AttributeOptionLookup, build_attribute_option_lookup
+
+
+class AttributeCatalog:
+    """Snapshot of the 'product' attribute catalog, safe to share between requests"""
+
+    def __init__(self, attributes: list[AvailableAttribute], attribute_ids: dict[str, int], version: int):
+        self.attributes = attributes
+        self.attribute_ids = attribute_ids
+        self.attribute_codes = {attribute_id: code for code, attribute_id in attribute_ids.items()}
+        self.options_by_id = {opt["id"]: opt for attr in attributes for opt in attr.options}
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self._option_lookup = None
+        self._fingerprint = None
+
+    @property
+    def option_lookup(self) -> dict[str, AttributeOptionLookup]:
+        """Resolver lookup built from the cached options, so writes need no extra query"""
+        if self._option_lookup is None:
+            rows = []
+            for attr in self.attributes:
+                attribute_id = self.attribute_ids[attr.attribute_code]
+                # Attributes without options still need an entry
+                rows.append((attribute_id, attr.attribute_code, None, None, None))
+                for opt in attr.options:
+                    rows.append((attribute_id, attr.attribute_code, opt["id"],
+                                 opt["attribute_option_en"], opt["attribute_option_vn"]))
+            self._option_lookup = build_attribute_option_lookup(rows)
+        return self._option_lookup
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the catalog, used to memoize the dynamic product schemas"""
+        if self._fingerprint is None:
+            self._fingerprint = attributes_fingerprint(self.attributes)
+        return self._fingerprint
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+
+def load_attribute_catalog(db: Session, version: int = 0) -> AttributeCatalog:
+    """Load all available attributes for the 'product' group from the database"""
+    # Temporarily get all attributes until database is updated with attribute_group_id column
+    attributes = db.query(Attribute).join(AttributeGroupLink).join(AttributeGroup).filter(
+        AttributeGroup.group_name == AttributeGroupName.product
+    ).options(
+        joinedload(Attribute.attribute_group_links).joinedload(AttributeGroupLink.attribute_group),
+        joinedload(Attribute.attribute_options)
+    ).all()
+
+    available_attributes = []
+    attribute_ids = {}
+    for attr in attributes:
+        options = [
+            {
+                "id": opt.id,
+                "attribute_option_en": opt.attribute_option_en,
+                "attribute_option_vn": opt.attribute_option_vn
+            }
+            for opt in attr.attribute_options
+        ]
+
+        # Temporarily set group name as "Product" until database is updated with attribute_group_id column
+        group_name = "Product"
+
+        available_attributes.append(AvailableAttribute(
+            attribute_code=attr.attribute_code,
+            attribute_name_en=attr.attribute_name_en,
+            attribute_name_vn=attr.attribute_name_vn,
+            type_attribute=attr.type_attribute.value,
+            attribute_group=group_name,
+            options=options
+        ))
+        attribute_ids[attr.attribute_code] = attr.id
+
+    return AttributeCatalog(available_attributes, attribute_ids, version)
+
+
+class AttributeCatalogCache:
+    """Process-wide cache of the attribute catalog guarded by a version counter"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # Guards the version and the counters; separate from _lock (held during reloads)
+        # so writers never wait on a reload
+        self._version_lock = threading.Lock()
+        self._version = 0
+        self._catalog: Optional[AttributeCatalog] = None
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _count(self, hit: bool):
+        with self._version_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def _is_fresh(self, catalog: Optional[AttributeCatalog]) -> bool:
+        if catalog is None or catalog.version != self._version:
+            return False
+        return self.ttl_seconds <= 0 or catalog.age_seconds < self.ttl_seconds
+
+    def get(self, db: Session) -> AttributeCatalog:
+        """Return the cached catalog, reloading it when stale"""
+        catalog = self._catalog
+        if self._is_fresh(catalog):
+            self._count(hit=True)
+            return catalog
+
+        # Only one request reloads and publishes the result. Others load their own
+        # copy instead of waiting: with AsyncSession.run_sync every request shares the
+        # event loop thread, and blocking on the lock there would deadlock.
+        if not self._lock.acquire(blocking=False):
+            self._count(hit=False)
+            return load_attribute_catalog(db, self._version)
+        try:
+            catalog = self._catalog
+            if self._is_fresh(catalog):
+                self._count(hit=True)
+                return catalog
+            self._count(hit=False)
+            catalog = load_attribute_catalog(db, self._version)
+            self._catalog = catalog
+            return catalog
+        finally:
+            self._lock.release()
+
+    def invalidate(self) -> int:
+        """Bump the version so the next read reloads the catalog"""
+        # += is a separate read, add and store: concurrent invalidations could lose a bump
+        with self._version_lock:
+            self._version += 1
+            self._invalidations += 1
+            return self._version
+
+    def stats(self) -> dict:
+        catalog = self._catalog
+        with self._version_lock:
+            version, hits, misses, invalidations = self._version, self._hits, self._misses, self._invalidations
+        lookups = hits + misses
+        return {
+            "version": version,
+            "loaded_version": catalog.version if catalog else None,
+            "is_fresh": self._is_fresh(catalog),
+            "age_seconds": round(catalog.age_seconds, 3) if catalog else None,
+            "ttl_seconds": self.ttl_seconds,
+            "attribute_count": len(catalog.attributes) if catalog else 0,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "invalidations": invalidations,
+        }
+
+
+attribute_catalog_cache = AttributeCatalogCache(ATTRIBUTE_CATALOG_TTL_SECONDS)
+
+
+def get_attribute_catalog(db: Session) -> AttributeCatalog:
+    return attribute_catalog_cache.get(db)
+
+
+def get_product_attributes(db: Session) -> list[AvailableAttribute]:
+    """Get all available attributes for the 'product' group (cached)"""
+    return attribute_catalog_cache.get(db).attributes
+
+
+def invalidate_attribute_catalog() -> int:
+    return attribute_catalog_cache.invalidate()
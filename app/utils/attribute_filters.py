@@ -0,0 +1,79 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Query, Session
+from app.models.product import Product
+from app.models.product_attribute_value_index import ProductAttributeValueIndex
+from app.utils.attribute_resolver import AttributeResolutionError
+
+ATTRIBUTE_FILTER_PREFIX = "attr."
+
+
+def parse_attribute_filters(query_params, catalog) -> dict[int, list[int]]:
+    """Turn `attr.<code>=<value>` query parameters into {attribute_id: [option_id, ...]}.
+
+    Values may be option ids or English/Vietnamese option text. Repeating a
+    parameter matches any of its values; different attributes must all match.
+    """
+    filters = {}
+    for key in set(query_params.keys()):
+        if not key.startswith(ATTRIBUTE_FILTER_PREFIX):
+            continue
+        attribute_code = key[len(ATTRIBUTE_FILTER_PREFIX):]
+        attribute_lookup = catalog.option_lookup.get(attribute_code)
+        if attribute_lookup is None:
+            raise AttributeResolutionError(f"Attribute '{attribute_code}' not found in product group")
+
+        option_ids = []
+        for option_value in query_params.getlist(key):
+            option_id = attribute_lookup.find(option_value)
+            if option_id is None:
+                raise AttributeResolutionError(
+                    f"Attribute option '{option_value}' not found for attribute '{attribute_code}'"
+                )
+            option_ids.append(option_id)
+        filters[attribute_lookup.attribute_id] = option_ids
+    return filters
+
+
+def apply_attribute_filters(query: Query, filters: dict[int, list[int]]) -> Query:
+    """Intersect the product query with one index lookup per filtered attribute.
+
+    Each lookup is served by the (attribute_id, attribute_option_id, product_id)
+    index without touching the table.
+    """
+    for attribute_id, option_ids in filters.items():
+        query = query.filter(Product.id.in_(
+            select(ProductAttributeValueIndex.product_id).where(
+                ProductAttributeValueIndex.attribute_id == attribute_id,
+                ProductAttributeValueIndex.attribute_option_id.in_(option_ids)
+            )
+        ))
+    return query
+
+
+def facet_counts(db: Session, query: Query, catalog, filters: dict[int, list[int]]) -> dict[str, list[dict]]:
+    """Count products per option for every attribute that is not already filtered on"""
+    product_ids = query.order_by(None).with_entities(Product.id).scalar_subquery()
+    stmt = select(
+        ProductAttributeValueIndex.attribute_id,
+        ProductAttributeValueIndex.attribute_option_id,
+        func.count(ProductAttributeValueIndex.product_id)
+    ).where(
+        ProductAttributeValueIndex.product_id.in_(product_ids)
+    ).group_by(
+        ProductAttributeValueIndex.attribute_id,
+        ProductAttributeValueIndex.attribute_option_id
+    )
+    if filters:
+        stmt = stmt.where(ProductAttributeValueIndex.attribute_id.not_in(list(filters)))
+
+    facets = {}
+    for attribute_id, option_id, count in db.execute(stmt):
+        attribute_code = catalog.attribute_codes.get(attribute_id)
+        option = catalog.options_by_id.get(option_id)
+        if attribute_code is None or option is None:
+            continue
+        facets.setdefault(attribute_code, []).append({**option, "count": count})
+
+    for options in facets.values():
+        options.sort(key=lambda option: (-option["count"], option["id"]))
+    return facets
@@ -0,0 +1,92 @@
+from typing import Iterable, Optional
+from sqlalchemy.orm import Session
+from app.models.attribute import Attribute
+from app.models.attribute_option import AttributeOption
+
+
+class AttributeResolutionError(ValueError):
+    """Raised when an attribute code or option value cannot be resolved"""
+
+
+class AttributeOptionLookup:
+    """In-memory map of one attribute's options by id, English and Vietnamese text"""
+
+    def __init__(self, attribute_id: int):
+        self.attribute_id = attribute_id
+        self.by_id: dict[str, int] = {}
+        self.by_text: dict[str, int] = {}
+
+    def add_option(self, option_id: int, option_en: Optional[str], option_vn: Optional[str]):
+        self.by_id[str(option_id)] = option_id
+        # Keep the first match, like the previous `.first()` lookups did
+        for text in (option_en, option_vn):
+            if text is not None:
+                self.by_text.setdefault(text, option_id)
+
+    def find(self, option_value: str) -> Optional[int]:
+        option_id = None
+        if option_value.isdigit():
+            # Try to find by ID first
+            option_id = self.by_id.get(option_value)
+        if option_id is None:
+            # Try to find by text (English or Vietnamese)
+            option_id = self.by_text.get(option_value)
+        return option_id
+
+
+def build_attribute_option_lookup(rows: Iterable[tuple]) -> dict[str, AttributeOptionLookup]:
+    """Build lookups from (attribute_id, attribute_code, option_id, option_en, option_vn) rows"""
+    lookup = {}
+    for attribute_id, attribute_code, option_id, option_en, option_vn in rows:
+        attribute_lookup = lookup.get(attribute_code)
+        if attribute_lookup is None:
+            attribute_lookup = lookup[attribute_code] = AttributeOptionLookup(attribute_id)
+        if option_id is not None:
+            attribute_lookup.add_option(option_id, option_en, option_vn)
+    return lookup
+
+
+def load_attribute_option_lookup(db: Session, attribute_codes: Iterable[str]) -> dict[str, AttributeOptionLookup]:
+    """Load the requested attributes and all of their options in a single query"""
+    attribute_codes = set(attribute_codes)
+    if not attribute_codes:
+        return {}
+    rows = db.query(
+        Attribute.id,
+        Attribute.attribute_code,
+        AttributeOption.id,
+        AttributeOption.attribute_option_en,
+        AttributeOption.attribute_option_vn
+    ).outerjoin(
+        AttributeOption, AttributeOption.attribute_code == Attribute.attribute_code
+    ).filter(
+        Attribute.attribute_code.in_(attribute_codes)
+    ).order_by(Attribute.id, AttributeOption.id).all()
+    return build_attribute_option_lookup(rows)
+
+
+def resolve_attribute_values(
+    lookup: dict[str, AttributeOptionLookup], attribute_values: dict
+) -> list[tuple[int, Optional[int]]]:
+    """Resolve {attribute_code: option value} into (attribute_id, attribute_option_id) pairs.
+
+    Empty values resolve to (attribute_id, None) so callers can clear them.
+    """
+    resolved = []
+    for attribute_code, option_value in attribute_values.items():
+        attribute_lookup = lookup.get(attribute_code)
+        if not option_value:
+            if attribute_lookup is not None:
+                resolved.append((attribute_lookup.attribute_id, None))
+            continue
+
+        if attribute_lookup is None:
+            raise AttributeResolutionError(f"Attribute '{attribute_code}' not found in product group")
+
+        option_id = attribute_lookup.find(str(option_value))
+        if option_id is None:
+            raise AttributeResolutionError(
+                f"Attribute option '{option_value}' not found for attribute '{attribute_code}'"
+            )
+        resolved.append((attribute_lookup.attribute_id, option_id))
+    return resolved
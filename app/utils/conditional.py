@@ -0,0 +1,108 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import Query
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from anything that identifies a version of a response body"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def content_etag(value) -> str:
+    """Weak ETag from the JSON content of a response body"""
+    return make_etag(json.dumps(value, sort_keys=True, default=str))
+
+
+def row_values(row) -> tuple:
+    """Type and column values of an ORM row.
+
+    Changes on every write, unlike last_modified_date (one-second resolution on SQLite).
+    """
+    return (type(row).__name__, *(getattr(row, attr.key) for attr in inspect(row).mapper.column_attrs))
+
+
+def collection_version(query: Query, model) -> tuple[str, int, Optional[datetime]]:
+    """Row count and newest last_modified_date of the rows a query matches, in one aggregate query"""
+    count, last_modified = query.order_by(None).with_entities(
+        func.count(model.id), func.max(model.last_modified_date)
+    ).one()
+    return model.__tablename__, count, last_modified
+
+
+def collection_validators(*versions: tuple[str, int, Optional[datetime]], extra=()) -> tuple[str, Optional[datetime]]:
+    """ETag and Last-Modified for a list built from one or more collection versions"""
+    timestamps = [last_modified for _, _, last_modified in versions if last_modified is not None]
+    return make_etag(*versions, *extra), max(timestamps, default=None)
+
+
+def page_validators(rows: list, extra=()) -> tuple[str, Optional[datetime]]:
+    """ETag and Last-Modified for one page of a list, from the column values of its rows.
+
+    Costs nothing beyond the page query itself, unlike collection_version.
+    """
+    timestamps = [row.last_modified_date for row in rows if row.last_modified_date is not None]
+    etag = make_etag(*(row_values(row) for row in rows), *extra)
+    return etag, max(timestamps, default=None)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive timestamps; func.now() stores them in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are the same validator
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def check_not_modified(
+    request: Request, response: Response, etag: str, last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """Set ETag/Last-Modified on the response; return a 304 when the client's copy is current.
+
+    Call before building the body so an unchanged resource is never serialized.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        last_modified = _as_utc(last_modified)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        not_modified = False
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and last_modified is not None:
+            try:
+                not_modified = last_modified <= _as_utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                not_modified = False
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def row_validators(row, *related) -> tuple[str, Optional[datetime]]:
+    """ETag and Last-Modified for a single resource from its column values.
+
+    `related` are rows embedded in the response (e.g. an operator's country).
+    """
+    rows = [item for item in (row, *related) if item is not None]
+    timestamps = [item.last_modified_date for item in rows if item.last_modified_date is not None]
+    etag = make_etag(*(row_values(item) for item in rows))
+    return etag, max(timestamps, default=None)
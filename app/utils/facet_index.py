@@ -0,0 +1,301 @@
+import threading
+import time
+from array import array
+from datetime import timedelta
+from typing import Iterable, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.config import FACET_INDEX_REBUILD_SECONDS, FACET_INDEX_SYNC_SECONDS
+from app.models.product import Product
+from app.models.product_attribute_value_index import ProductAttributeValueIndex
+from app.utils.enums.status import Status
+
+# Products modified this long before the last seen last_modified_date are re-applied on every
+# sync: covers transactions that commit after a later timestamp was already seen
+SYNC_OVERLAP = timedelta(seconds=60)
+# Rows fetched per round trip while loading
+LOAD_BATCH_SIZE = 10000
+# Statuses as one-byte codes in the reverse map (0 = product not seen)
+STATUSES = [None, *Status]
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES) if status is not None}
+
+
+def bits_from_ids(ids: Iterable[int]) -> int:
+    """Bitset with bit `id` set for every id (bytearray build, then one int conversion)"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray((max(ids) >> 3) + 1)
+    for product_id in ids:
+        buffer[product_id >> 3] |= 1 << (product_id & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _grow(values: array, size: int):
+    """Extend a reverse map with zeros so that index size - 1 exists"""
+    if len(values) < size:
+        values.frombytes(bytes((size - len(values)) * values.itemsize))
+
+
+def _move_bits(bits: int, cleared: Iterable[int], joined: Iterable[int]) -> int:
+    """The bitset without the cleared ids and with the joined ones"""
+    return (bits & ~bits_from_ids(cleared)) | bits_from_ids(joined)
+
+
+def iter_ids(bits: int, after: int = 0):
+    """Set bits above `after`, ascending"""
+    bits >>= after + 1
+    offset = after + 1
+    while bits:
+        low = bits & -bits
+        position = low.bit_length() - 1
+        yield offset + position
+        bits >>= position + 1
+        offset += position + 1
+
+
+class FacetIndex:
+    """In-process bitmap index of the product attribute values.
+
+    One bitset (a Python int, bit i = product id i) per (attribute_id,
+    attribute_option_id) and per status. Filters are ANDs of ORs of bitsets
+    and facet counts are popcounts of their intersections, all running in C
+    over machine words. Kept current by a delta sync on last_modified_date,
+    which also picks up writes made by other worker processes.
+
+    A product has at most one option per attribute and one status, so reverse
+    maps (per attribute, an array of option id by product id) tell a sync which
+    bitsets a changed product leaves; only those and the ones it joins are rebuilt.
+    """
+
+    def __init__(self, sync_seconds: float = FACET_INDEX_SYNC_SECONDS, rebuild_seconds: float = FACET_INDEX_REBUILD_SECONDS):
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self.option_bits: dict[tuple[int, int], int] = {}
+        self.status_bits: dict[Status, int] = {}
+        self.all_bits = 0
+        # Reverse maps used by the delta sync: option id (0 = none) and status code by product id
+        self.product_options: dict[int, array] = {}
+        self.product_status = bytearray()
+        self.loaded_at: Optional[float] = None
+        self.synced_at = 0.0
+        self.watermark = None
+        self.load_seconds: Optional[float] = None
+        self.syncs = 0
+        self.synced_products = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def load(self, db: Session):
+        """Build the whole index from the (attribute_id, attribute_option_id, product_id) index"""
+        with self._lock:
+            self._load(db)
+
+    def _load(self, db: Session):
+        started = time.perf_counter()
+        option_ids: dict[tuple[int, int], list[int]] = {}
+        rows = db.execute(
+            select(
+                ProductAttributeValueIndex.attribute_id,
+                ProductAttributeValueIndex.attribute_option_id,
+                ProductAttributeValueIndex.product_id
+            ).execution_options(yield_per=LOAD_BATCH_SIZE)
+        )
+        for attribute_id, option_id, product_id in rows:
+            option_ids.setdefault((attribute_id, option_id), []).append(product_id)
+
+        status_ids: dict[Status, list[int]] = {}
+        for product_id, status in db.execute(
+            select(Product.id, Product.status).execution_options(yield_per=LOAD_BATCH_SIZE)
+        ):
+            status_ids.setdefault(status, []).append(product_id)
+        watermark = db.execute(select(func.max(Product.last_modified_date))).scalar()
+
+        size = max((max(ids) for ids in status_ids.values()), default=0) + 1
+        product_options: dict[int, array] = {}
+        for (attribute_id, option_id), ids in option_ids.items():
+            options = product_options.get(attribute_id)
+            if options is None:
+                options = product_options[attribute_id] = array("i")
+            _grow(options, max(max(ids) + 1, size))
+            for product_id in ids:
+                options[product_id] = option_id
+        product_status = bytearray(size)
+        for status, ids in status_ids.items():
+            for product_id in ids:
+                product_status[product_id] = STATUS_CODES[status]
+
+        # Swap in complete dicts: readers keep using the old ones until then
+        self.option_bits = {key: bits_from_ids(ids) for key, ids in option_ids.items()}
+        self.status_bits = {status: bits_from_ids(ids) for status, ids in status_ids.items()}
+        self.all_bits = bits_from_ids(product_id for ids in status_ids.values() for product_id in ids)
+        self.product_options = product_options
+        self.product_status = product_status
+        self.watermark = watermark
+        self.loaded_at = self.synced_at = time.monotonic()
+        self.load_seconds = round(time.perf_counter() - started, 3)
+
+    def mark_stale(self):
+        """Sync on the next read (called after local product writes)"""
+        self.synced_at = 0.0
+
+    def sync(self, db: Session, force: bool = False):
+        """Re-apply products modified since the watermark; rebuild when the index is old"""
+        now = time.monotonic()
+        if not force and now - self.synced_at < self.sync_seconds:
+            return
+        # Readers never wait: whoever holds the lock syncs, everyone else uses the current bits
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self.rebuild_seconds > 0 and now - self.loaded_at >= self.rebuild_seconds:
+                # Safety net for changes the delta sync cannot see
+                self._load(db)
+                return
+
+            query = select(Product.id, Product.status, Product.last_modified_date)
+            if self.watermark is not None:
+                query = query.where(Product.last_modified_date >= self.watermark - SYNC_OVERLAP)
+            changed = db.execute(query).all()
+            self.synced_at = now
+            self.syncs += 1
+            if changed:
+                self._apply(db, changed)
+        finally:
+            self._lock.release()
+
+    def _apply(self, db: Session, changed: list):
+        """Move the changed products out of the bitsets they left and into the ones they joined"""
+        product_ids = [row.id for row in changed]
+        current: dict[int, dict[int, int]] = {product_id: {} for product_id in product_ids}
+        for start in range(0, len(product_ids), LOAD_BATCH_SIZE):
+            for attribute_id, option_id, product_id in db.execute(
+                select(
+                    ProductAttributeValueIndex.attribute_id,
+                    ProductAttributeValueIndex.attribute_option_id,
+                    ProductAttributeValueIndex.product_id
+                ).where(ProductAttributeValueIndex.product_id.in_(product_ids[start:start + LOAD_BATCH_SIZE]))
+            ):
+                current[product_id][attribute_id] = option_id
+
+        size = max(product_ids) + 1
+        if len(self.product_status) < size:
+            self.product_status.extend(bytes(size - len(self.product_status)))
+        cleared: dict[tuple[int, int], list[int]] = {}
+        joined: dict[tuple[int, int], list[int]] = {}
+        status_cleared: dict[Status, list[int]] = {}
+        status_joined: dict[Status, list[int]] = {}
+        for row in changed:
+            old_code, new_code = self.product_status[row.id], STATUS_CODES[row.status]
+            if old_code != new_code:
+                if old_code:
+                    status_cleared.setdefault(STATUSES[old_code], []).append(row.id)
+                status_joined.setdefault(row.status, []).append(row.id)
+                self.product_status[row.id] = new_code
+
+            values = current[row.id]
+            for attribute_id in set(self.product_options) | set(values):
+                options = self.product_options.get(attribute_id)
+                if options is None:
+                    options = self.product_options[attribute_id] = array("i")
+                _grow(options, size)
+                old_option, new_option = options[row.id], values.get(attribute_id, 0)
+                if old_option == new_option:
+                    continue
+                if old_option:
+                    cleared.setdefault((attribute_id, old_option), []).append(row.id)
+                if new_option:
+                    joined.setdefault((attribute_id, new_option), []).append(row.id)
+                options[row.id] = new_option
+
+        # Rebuild only the touched bitsets, in copies of the dicts swapped in at the end so
+        # readers holding the old ones are not disturbed
+        option_bits = dict(self.option_bits)
+        for key in set(cleared) | set(joined):
+            option_bits[key] = _move_bits(option_bits.get(key, 0), cleared.get(key, ()), joined.get(key, ()))
+        status_bits = dict(self.status_bits)
+        for status in set(status_cleared) | set(status_joined):
+            status_bits[status] = _move_bits(status_bits.get(status, 0), status_cleared.get(status, ()), status_joined.get(status, ()))
+        self.option_bits = option_bits
+        self.status_bits = status_bits
+        self.all_bits |= bits_from_ids(product_ids)
+        timestamps = [row.last_modified_date for row in changed if row.last_modified_date is not None]
+        if self.watermark is not None:
+            timestamps.append(self.watermark)
+        self.watermark = max(timestamps, default=None)
+        self.synced_products += len(changed)
+
+    def matching(self, status: Optional[Status], filters: dict[int, list[int]]) -> int:
+        """Product ids with the status (if given) and, per filtered attribute, any of its options"""
+        bits = self.status_bits.get(status, 0) if status is not None else self.all_bits
+        for attribute_id, option_ids in filters.items():
+            any_option = 0
+            for option_id in option_ids:
+                any_option |= self.option_bits.get((attribute_id, option_id), 0)
+            bits &= any_option
+        return bits
+
+    def facet_counts(self, candidates: int, catalog, filters: dict[int, list[int]]) -> dict[str, list[dict]]:
+        """Same result as attribute_filters.facet_counts, from popcounts of the intersections"""
+        facets = {}
+        for (attribute_id, option_id), bits in self.option_bits.items():
+            if attribute_id in filters:
+                continue
+            attribute_code = catalog.attribute_codes.get(attribute_id)
+            option = catalog.options_by_id.get(option_id)
+            if attribute_code is None or option is None:
+                continue
+            count = (bits & candidates).bit_count()
+            if count:
+                facets.setdefault(attribute_code, []).append({**option, "count": count})
+        for options in facets.values():
+            options.sort(key=lambda option: (-option["count"], option["id"]))
+        return facets
+
+    def page_ids(self, candidates: int, after_id: int, limit: int) -> list[int]:
+        """The first `limit` candidate ids greater than after_id"""
+        ids = []
+        for product_id in iter_ids(candidates, after_id):
+            ids.append(product_id)
+            if len(ids) == limit:
+                break
+        return ids
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "age_seconds": round(time.monotonic() - self.loaded_at, 3) if self.loaded else None,
+            "load_seconds": self.load_seconds,
+            "products": self.all_bits.bit_count(),
+            "bitsets": len(self.option_bits) + len(self.status_bits),
+            "memory_bytes": sum((bits.bit_length() + 7) // 8 for bits in self.option_bits.values())
+                            + sum((bits.bit_length() + 7) // 8 for bits in self.status_bits.values()),
+            "reverse_map_bytes": sum(len(options) * options.itemsize for options in self.product_options.values())
+                                 + len(self.product_status),
+            "watermark": self.watermark.isoformat() if self.watermark is not None else None,
+            "sync_seconds": self.sync_seconds,
+            "syncs": self.syncs,
+            "synced_products": self.synced_products,
+        }
+
+
+facet_index = FacetIndex()
+
+
+def get_facet_index(db: Session) -> Optional[FacetIndex]:
+    """The synced index, or None while it is being loaded (callers fall back to SQL)"""
+    if not facet_index.loaded:
+        # Normally loaded by the startup warm-up; otherwise the first request builds it
+        if not facet_index._lock.acquire(blocking=False):
+            return None
+        try:
+            if not facet_index.loaded:
+                facet_index._load(db)
+        finally:
+            facet_index._lock.release()
+        return facet_index
+    facet_index.sync(db)
+    return facet_index
@@ -0,0 +1,46 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        # Same format as Pydantic: UTC is written as "Z"
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize plain dicts/lists (with datetimes and enums) straight to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse for plain Python data: no Pydantic models, no jsonable_encoder pass.
+
+    Uses orjson when it is installed and the standard library otherwise.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def row_dict(row, fields) -> dict:
+    """Plain dict of the given attributes of an ORM row"""
+    return {field: getattr(row, field) for field in fields}
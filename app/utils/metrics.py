@@ -0,0 +1,159 @@
+import bisect
+import time
+from app.db.query_stats import QueryStats, current_query_stats
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bytes
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+# Statements per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name, self.documentation, self.labels = name, documentation, labels
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, label_values: tuple = (), amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        for label_values, value in self._values.items():
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, label_values: tuple = (), amount: float = 1):
+        self.inc(label_values, -amount)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name, self.documentation, self.labels = name, documentation, labels
+        self.buckets = buckets
+        # label values -> [count per bucket (+Inf last), sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, label_values: tuple, value: float):
+        series = self._values.get(label_values)
+        if series is None:
+            series = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self):
+        for label_values, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket", _format_labels(self.labels, label_values, le), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labels, label_values), total
+            yield f"{self.name}_count", _format_labels(self.labels, label_values), cumulative
+
+
+class MetricsRegistry:
+    """In-process metrics, rendered in the Prometheus text exposition format.
+
+    Values are only updated from the event loop (by MetricsMiddleware), so no
+    locking is needed.
+    """
+
+    def __init__(self):
+        self.requests = Counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+        self.latency = Histogram("http_request_duration_seconds", "Request latency", ("method", "route"))
+        self.in_flight = Gauge("http_requests_in_flight", "Requests being served", ("method",))
+        self.response_size = Histogram(
+            "http_response_size_bytes", "Response body size", ("method", "route"), buckets=SIZE_BUCKETS
+        )
+        self.db_statements = Histogram(
+            "db_statements_per_request", "SQL statements per request", ("method", "route"), buckets=QUERY_COUNT_BUCKETS
+        )
+        self.db_time = Histogram("db_time_per_request_seconds", "Time spent in SQL per request", ("method", "route"))
+        self.metrics = [self.requests, self.latency, self.in_flight, self.response_size, self.db_statements, self.db_time]
+
+    def render(self, extra_gauges: dict[str, float] = None) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        for name, value in (extra_gauges or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+def route_label(scope) -> str:
+    """Route template (e.g. /products/{product_id}) to keep label cardinality bounded"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, size, status and SQL stats per route"""
+
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        registry = self.registry
+        registry.in_flight.inc((method,))
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_query_stats.reset(token)
+            registry.in_flight.dec((method,))
+            labels = (method, route_label(scope))
+            registry.requests.inc((*labels, status))
+            registry.latency.observe(labels, elapsed)
+            registry.response_size.observe(labels, size)
+            registry.db_statements.observe(labels, stats.count)
+            registry.db_time.observe(labels, stats.total_seconds)
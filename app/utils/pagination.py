@@ -0,0 +1,89 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import func, literal, select, text, tuple_
+from sqlalchemy.orm import Query, Session
+
+# Keyset columns for each supported sort order (always ending with the primary key)
+SORT_KEYS = {
+    "id": ["id"],
+    "last_modified_date": ["last_modified_date", "id"],
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the sort order"""
+
+
+def encode_cursor(order_by: str, values: list) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor"""
+    payload = {
+        "o": order_by,
+        "k": [value.isoformat() if isinstance(value, datetime) else value for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["k"]
+        cursor_order = payload["o"]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+    if cursor_order != order_by or len(values) != len(SORT_KEYS[order_by]):
+        raise InvalidCursor(f"Cursor was issued for order_by='{cursor_order}'")
+    try:
+        return [
+            datetime.fromisoformat(value) if column == "last_modified_date" else int(value)
+            for column, value in zip(SORT_KEYS[order_by], values)
+        ]
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def apply_keyset(query: Query, model, order_by: str, cursor: Optional[str]) -> Query:
+    """Order the query by the keyset columns and start after the cursor position"""
+    columns = [getattr(model, name) for name in SORT_KEYS[order_by]]
+    if cursor:
+        values = decode_cursor(cursor, order_by)
+        if len(columns) == 1:
+            query = query.filter(columns[0] > values[0])
+        else:
+            bound = [literal(value, type_=column.type) for column, value in zip(columns, values)]
+            if query.session.get_bind().dialect.name == "sqlite":
+                # SQLite keeps server-side timestamps as 'YYYY-MM-DD HH:MM:SS' text; normalize the
+                # bound value the same way so the text comparison is correct
+                bound = [func.datetime(value) if isinstance(raw, datetime) else value
+                         for value, raw in zip(bound, values)]
+            query = query.filter(tuple_(*columns) > tuple_(*bound))
+    return query.order_by(*columns)
+
+
+def next_cursor_for(rows: list, order_by: str) -> str:
+    return encode_cursor(order_by, [getattr(rows[-1], name) for name in SORT_KEYS[order_by]])
+
+
+def estimate_total(db: Session, query: Query, model, filtered: bool) -> tuple[int, bool]:
+    """Return (total, is_estimate).
+
+    On PostgreSQL an unfiltered count is read from the planner statistics,
+    which is O(1); everything else falls back to an exact COUNT(*).
+    """
+    if not filtered and db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": model.__tablename__}
+        ).scalar()
+        # reltuples is -1 (or missing) until the table has been analyzed
+        if estimate is not None and estimate >= 0:
+            return int(estimate), True
+
+    total = db.execute(
+        select(func.count()).select_from(query.order_by(None).with_entities(model.id).subquery())
+    ).scalar()
+    return total, False
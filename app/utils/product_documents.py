@@ -0,0 +1,173 @@
+import re
+import unicodedata
+from typing import Iterable, Optional
+from sqlalchemy import delete, distinct, func, or_, select
+from sqlalchemy.orm import Session, selectinload
+from app.db import session
+from app.models.product import Product
+from app.models.product_attribute_value_index import ProductAttributeValueIndex
+from app.models.product_document import ProductDocument
+from app.schemas.product import create_dynamic_product_out_schema, format_product_for_dynamic_schema
+from app.utils.attribute_catalog import AttributeCatalog, get_attribute_catalog
+from app.utils.upsert import upsert_insert
+
+# Products whose documents are rebuilt per statement by the batched refreshes
+DOCUMENT_REFRESH_CHUNK_SIZE = 1000
+
+
+def build_product_document(product: Product, catalog: AttributeCatalog) -> dict:
+    """Render a product exactly as the dynamic product schema would, as plain JSON"""
+    ProductOutSchema = create_dynamic_product_out_schema(catalog.attributes, catalog.fingerprint)
+    return ProductOutSchema(**format_product_for_dynamic_schema(product, catalog)).model_dump(mode="json")
+
+
+def normalize_search_text(value: Optional[str]) -> str:
+    """Lowercase, strip Vietnamese (and other) diacritics, fold đ to d and collapse whitespace"""
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFD", value.replace("đ", "d").replace("Đ", "D"))
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return re.sub(r"\s+", " ", value).strip().lower()
+
+
+def build_search_text(document: dict) -> str:
+    """Everything ops search for: code, note and the option labels in both languages"""
+    parts = [document.get("product_code"), document.get("note")]
+    parts.extend((document.get("attribute") or {}).values())
+    parts.extend((document.get("attribute_vn") or {}).values())
+    return normalize_search_text(" ".join(str(part) for part in parts if part))
+
+
+def render_product_documents(db: Session, product_ids: list[int], catalog: AttributeCatalog) -> list[dict]:
+    """Build documents from the normalized tables without storing them"""
+    products = db.query(Product).options(
+        selectinload(Product.product_attribute_value_index)
+    ).filter(Product.id.in_(product_ids)).populate_existing().all()
+    return [build_product_document(product, catalog) for product in products]
+
+
+def refresh_product_documents(db: Session, product_ids: Iterable[int], catalog: Optional[AttributeCatalog] = None) -> list[dict]:
+    """Rebuild the documents of the given products inside the caller's transaction.
+
+    Costs two reads (products, then their attribute values) and one multi-row
+    INSERT ... ON CONFLICT write however many products are refreshed.
+    """
+    product_ids = list(set(product_ids))
+    if not product_ids:
+        return []
+    catalog = catalog or get_attribute_catalog(db)
+
+    # Make pending changes of the current transaction visible to the reload below
+    db.flush()
+    rows = []
+    for document in render_product_documents(db, product_ids, catalog):
+        rows.append({
+            "product_id": document["id"],
+            "product_code": document["product_code"],
+            "document": document,
+            "catalog_fingerprint": catalog.fingerprint,
+            "search_text": build_search_text(document),
+        })
+    # Upsert rather than DELETE + INSERT: two transactions refreshing the same product
+    # must not collide on the primary key
+    if rows:
+        stmt = upsert_insert(db, ProductDocument)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[ProductDocument.product_id],
+            set_={
+                "product_code": stmt.excluded.product_code,
+                "document": stmt.excluded.document,
+                "catalog_fingerprint": stmt.excluded.catalog_fingerprint,
+                "search_text": stmt.excluded.search_text,
+                "last_modified_date": func.now(),
+            },
+        ), rows)
+    found = {row["product_id"] for row in rows}
+    removed = [product_id for product_id in product_ids if product_id not in found]
+    if removed:
+        db.execute(delete(ProductDocument).where(ProductDocument.product_id.in_(removed)))
+    return [row["document"] for row in rows]
+
+
+def get_product_document(db: Session, product_id: Optional[int] = None, product_code: Optional[str] = None) -> Optional[dict]:
+    """Fetch a product's document with a single-row lookup.
+
+    Reads never write: documents are rebuilt by product writes, by the background
+    refresh after catalog edits and by the backfill. A product without a document
+    (created before the read model existed) is rendered for this response only.
+    """
+    query = db.query(ProductDocument.document)
+    if product_id is not None:
+        document = query.filter(ProductDocument.product_id == product_id).scalar()
+    else:
+        document = query.filter(ProductDocument.product_code == product_code).scalar()
+    if document is not None:
+        return document
+
+    if product_id is None:
+        product_id = db.query(Product.id).filter(Product.product_code == product_code).scalar()
+        if product_id is None:
+            return None
+    documents = render_product_documents(db, [product_id], get_attribute_catalog(db))
+    return documents[0] if documents else None
+
+
+def get_product_documents(db: Session, product_ids: Iterable[int] = (), product_codes: Iterable[str] = ()) -> list[dict]:
+    """Fetch the documents of many products with one IN query (read-only, like get_product_document)"""
+    product_ids, product_codes = list(product_ids), list(product_codes)
+    conditions = []
+    if product_ids:
+        conditions.append(ProductDocument.product_id.in_(product_ids))
+    if product_codes:
+        conditions.append(ProductDocument.product_code.in_(product_codes))
+    if not conditions:
+        return []
+    rows = db.query(ProductDocument.product_id, ProductDocument.product_code, ProductDocument.document).filter(
+        or_(*conditions)
+    ).all()
+    documents = {row.product_id: row.document for row in rows}
+
+    # Keys without a document are unknown products or ones created before the read model existed
+    found_codes = {row.product_code for row in rows}
+    missing_ids = [product_id for product_id in product_ids if product_id not in documents]
+    missing_codes = [code for code in product_codes if code not in found_codes]
+    if missing_ids or missing_codes:
+        unrendered = db.execute(select(Product.id).where(
+            or_(Product.id.in_(missing_ids), Product.product_code.in_(missing_codes))
+        )).scalars().all()
+        if unrendered:
+            for document in render_product_documents(db, unrendered, get_attribute_catalog(db)):
+                documents[document["id"]] = document
+    return list(documents.values())
+
+
+def _refresh_documents_using(condition):
+    """Rebuild, in chunks with one commit each, the documents of products with a matching attribute value"""
+    with session.SessionLocal() as db:
+        product_ids = db.execute(
+            select(distinct(ProductAttributeValueIndex.product_id))
+            .where(condition)
+            .order_by(ProductAttributeValueIndex.product_id)
+        ).scalars().all()
+        catalog = get_attribute_catalog(db)
+        for start in range(0, len(product_ids), DOCUMENT_REFRESH_CHUNK_SIZE):
+            refresh_product_documents(db, product_ids[start:start + DOCUMENT_REFRESH_CHUNK_SIZE], catalog)
+            db.commit()
+
+
+def refresh_option_documents(option_ids: Iterable[int]):
+    """Rebuild the documents, and so the search_text, of every product using one of the options.
+
+    Run as a background task after option labels change: reads serve stored documents
+    as they are, so documents built with the old labels would otherwise stay.
+    """
+    option_ids = list(option_ids)
+    if option_ids:
+        _refresh_documents_using(ProductAttributeValueIndex.attribute_option_id.in_(option_ids))
+
+
+def refresh_attribute_documents(attribute_ids: Iterable[int]):
+    """Rebuild the documents of every product with a value for one of the attributes (code renames)"""
+    attribute_ids = list(attribute_ids)
+    if attribute_ids:
+        _refresh_documents_using(ProductAttributeValueIndex.attribute_id.in_(attribute_ids))
@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+from typing import Iterator, Optional
+from sqlalchemy import select
+from app.db.session import SessionLocal
+from app.models.attribute import Attribute
+from app.models.attribute_option import AttributeOption
+from app.models.product import Product
+from app.models.product_attribute_value_index import ProductAttributeValueIndex
+from app.utils.enums.status import Status
+
+EXPORT_FIELDS = ['id', 'product_code', 'status', 'vendor_code', 'operator_code', 'supported_countries', 'note',
+                 'date_created', 'last_modified_date']
+
+
+def _plain(value):
+    if isinstance(value, Status):
+        return value.value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def iter_product_batches(status: Optional[Status] = None, batch_size: int = 1000) -> Iterator[list[dict]]:
+    """Yield products as plain dicts, one batch at a time, through a server-side cursor.
+
+    Uses its own session because the response body is produced after the
+    request's dependencies have been cleaned up.
+    """
+    db = SessionLocal()
+    try:
+        stmt = select(*[getattr(Product, field) for field in EXPORT_FIELDS]).order_by(Product.id)
+        if status:
+            stmt = stmt.where(Product.status == status)
+
+        # yield_per streams rows from a server-side cursor instead of buffering the result
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            products = {}
+            for row in partition:
+                product = {field: _plain(value) for field, value in zip(EXPORT_FIELDS, row)}
+                product['attribute'] = {}
+                products[product['id']] = product
+
+            # One query per batch for the attribute values of every product in it
+            values = db.execute(
+                select(
+                    ProductAttributeValueIndex.product_id,
+                    Attribute.attribute_code,
+                    AttributeOption.attribute_option_en
+                ).join(Attribute, Attribute.id == ProductAttributeValueIndex.attribute_id)
+                .join(AttributeOption, AttributeOption.id == ProductAttributeValueIndex.attribute_option_id)
+                .where(ProductAttributeValueIndex.product_id.in_(list(products)))
+            )
+            for product_id, attribute_code, option_en in values:
+                products[product_id]['attribute'][attribute_code] = option_en
+
+            yield list(products.values())
+    finally:
+        db.close()
+
+
+def iter_products_ndjson(batches: Iterator[list[dict]]) -> Iterator[str]:
+    for products in batches:
+        yield "".join(json.dumps(product, ensure_ascii=False) + "\n" for product in products)
+
+
+def iter_products_csv(batches: Iterator[list[dict]], attribute_codes: list[str]) -> Iterator[str]:
+    """Write one CSV row per product with an `attribute.<code>` column per attribute"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS + [f"attribute.{code}" for code in attribute_codes])
+    # Send the header right away so the first byte does not wait for the first batch
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    for products in batches:
+        for product in products:
+            writer.writerow(
+                [product[field] for field in EXPORT_FIELDS]
+                + [product['attribute'].get(code) for code in attribute_codes]
+            )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
@@ -0,0 +1,194 @@
+import json
+from typing import Any, AsyncIterator, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models.product import Product
+from app.models.product_attribute_value_index import ProductAttributeValueIndex
+from app.models.vendor import Vendor
+from app.models.operator import Operator
+from app.models.country import Country
+from app.schemas.product import (
+    ProductBulkCreated, ProductBulkError, ProductBulkResult,
+    create_dynamic_product_create_schema, extract_attributes_from_request
+)
+from app.utils.attribute_catalog import AttributeCatalog
+from app.utils.attribute_resolver import AttributeResolutionError, resolve_attribute_values
+from app.utils.product_documents import refresh_product_documents
+
+BASE_FIELDS = ['product_code', 'status', 'vendor_code', 'operator_code', 'supported_countries', 'note']
+
+
+class ProductBulkImporter:
+    """Validate and insert products in chunks, collecting a per-row report.
+
+    Each chunk is validated in memory against the cached attribute catalog,
+    checked with one IN query per referenced table, and then written with one
+    multi-row INSERT for products and one for their attribute values inside a
+    single transaction. A chunk that still fails at the database is retried
+    row by row in savepoints so only the offending rows are rejected.
+    """
+
+    def __init__(self, db: Session, catalog: AttributeCatalog):
+        self.db = db
+        self.catalog = catalog
+        self.schema = create_dynamic_product_create_schema(catalog.attributes, catalog.fingerprint)
+        self.total = 0
+        self.created: list[ProductBulkCreated] = []
+        self.errors: list[ProductBulkError] = []
+        self._seen_codes: set[str] = set()
+
+    def reject(self, row: int, detail: str, product_code: Optional[str] = None):
+        self.errors.append(ProductBulkError(row=row, product_code=product_code, detail=detail))
+
+    def import_chunk(self, rows: list[tuple[int, Any]]):
+        """Import a list of (row number, raw product dict) pairs"""
+        self.total += len(rows)
+        prepared = []
+        for row, request_data in rows:
+            item = self._prepare(row, request_data)
+            if item is not None:
+                prepared.append(item)
+
+        prepared = self._check_references(prepared)
+        if not prepared:
+            return
+
+        try:
+            created = self._insert(prepared)
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            self._insert_one_by_one(prepared)
+        else:
+            self.created.extend(created)
+
+    def result(self) -> ProductBulkResult:
+        return ProductBulkResult(
+            total=self.total,
+            created=len(self.created),
+            failed=len(self.errors),
+            products=self.created,
+            errors=sorted(self.errors, key=lambda error: error.row)
+        )
+
+    def _prepare(self, row: int, request_data: Any) -> Optional[tuple]:
+        if isinstance(request_data, bytes):
+            # Raw NDJSON line, parsed here so the work stays off the event loop
+            try:
+                request_data = json.loads(request_data)
+            except ValueError as e:
+                self.reject(row, f"Invalid JSON: {str(e)}")
+                return None
+        if not isinstance(request_data, dict):
+            self.reject(row, "Each product must be a JSON object")
+            return None
+        product_code = request_data.get('product_code')
+
+        try:
+            validated_data = self.schema(**request_data)
+        except Exception as e:
+            self.reject(row, f"Validation error: {str(e)}", product_code)
+            return None
+
+        if validated_data.product_code in self._seen_codes:
+            self.reject(row, "Duplicate product code in payload", validated_data.product_code)
+            return None
+        self._seen_codes.add(validated_data.product_code)
+
+        attribute_values = extract_attributes_from_request(request_data, self.catalog.attributes)
+        try:
+            resolved_values = resolve_attribute_values(self.catalog.option_lookup, attribute_values)
+        except AttributeResolutionError as e:
+            self.reject(row, str(e), validated_data.product_code)
+            return None
+
+        base_product_data = {field: getattr(validated_data, field) for field in BASE_FIELDS}
+        option_pairs = [(attribute_id, option_id) for attribute_id, option_id in resolved_values if option_id is not None]
+        return row, base_product_data, option_pairs
+
+    def _existing(self, column, values: set) -> set:
+        if not values:
+            return set()
+        return set(self.db.execute(select(column).where(column.in_(values))).scalars())
+
+    def _check_references(self, prepared: list[tuple]) -> list[tuple]:
+        """Reject existing product codes and unknown vendor/operator/country codes"""
+        if not prepared:
+            return prepared
+        existing_products = self._existing(Product.product_code, {data['product_code'] for _, data, _ in prepared})
+        vendors = self._existing(Vendor.vendor_code, {data['vendor_code'] for _, data, _ in prepared})
+        operators = self._existing(Operator.operator_code, {data['operator_code'] for _, data, _ in prepared})
+        countries = self._existing(Country.country_code, {data['supported_countries'] for _, data, _ in prepared})
+
+        valid = []
+        for row, data, option_pairs in prepared:
+            if data['product_code'] in existing_products:
+                self.reject(row, "Product code already exists", data['product_code'])
+            elif data['vendor_code'] not in vendors:
+                self.reject(row, f"Vendor '{data['vendor_code']}' not found", data['product_code'])
+            elif data['operator_code'] not in operators:
+                self.reject(row, f"Operator '{data['operator_code']}' not found", data['product_code'])
+            elif data['supported_countries'] not in countries:
+                self.reject(row, f"Country '{data['supported_countries']}' not found", data['product_code'])
+            else:
+                valid.append((row, data, option_pairs))
+        return valid
+
+    def _insert(self, prepared: list[tuple]) -> list[ProductBulkCreated]:
+        """Write the rows without committing; the caller reports them once the commit succeeds"""
+        inserted = self.db.execute(
+            insert(Product).returning(Product.id, Product.product_code),
+            [data for _, data, _ in prepared]
+        ).all()
+        product_ids = {product_code: product_id for product_id, product_code in inserted}
+
+        value_rows = [
+            {"product_id": product_ids[data['product_code']], "attribute_id": attribute_id, "attribute_option_id": option_id}
+            for _, data, option_pairs in prepared
+            for attribute_id, option_id in option_pairs
+        ]
+        if value_rows:
+            self.db.execute(insert(ProductAttributeValueIndex), value_rows)
+        refresh_product_documents(self.db, product_ids.values(), self.catalog)
+
+        return [
+            ProductBulkCreated(row=row, id=product_ids[data['product_code']], product_code=data['product_code'])
+            for row, data, _ in prepared
+        ]
+
+    def _database_error(self, row: int, error: SQLAlchemyError, product_code: str):
+        self.reject(row, f"Database error: {error.__class__.__name__}: {getattr(error, 'orig', error)}", product_code)
+
+    def _insert_one_by_one(self, prepared: list[tuple]):
+        created = []
+        for item in prepared:
+            row, data, _ = item
+            try:
+                with self.db.begin_nested():
+                    created.extend(self._insert([item]))
+            except SQLAlchemyError as e:
+                self._database_error(row, e, data['product_code'])
+        try:
+            self.db.commit()
+        except SQLAlchemyError as e:
+            # Nothing from this chunk was stored: report every row that had been written
+            self.db.rollback()
+            for entry in created:
+                self._database_error(entry.row, e, entry.product_code)
+        else:
+            self.created.extend(created)
+
+
+async def iter_ndjson_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Yield non-blank lines from a streamed NDJSON body without buffering all of it"""
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
@@ -0,0 +1,75 @@
+from sqlalchemy import case, column, func, literal, select, table, text
+from sqlalchemy.orm import Session
+from app.models.product_document import ProductDocument
+from app.utils.product_documents import get_product_documents, normalize_search_text
+
+# The SQLite trigram tokenizer cannot match terms shorter than this
+TRIGRAM_MIN_LENGTH = 3
+
+# FTS5 table created next to product_document on SQLite (see app/models/product_document.py)
+product_search = table("product_search", column("rowid"), column("rank"))
+
+
+def _code_rank(query: str):
+    """Exact product code first, then code prefixes, then everything else"""
+    code = func.lower(ProductDocument.product_code)
+    return case((code == query, 0), (code.startswith(query, autoescape=True), 1), else_=2)
+
+
+def _search_ids_postgresql(db: Session, query: str, terms: list[str], limit: int) -> list[int]:
+    base = select(ProductDocument.product_id)
+    for term in terms:
+        base = base.where(ProductDocument.search_text.contains(term, autoescape=True))
+    similarity = func.word_similarity(query, ProductDocument.search_text)
+    ranked = base.order_by(_code_rank(query), similarity.desc(), ProductDocument.product_id).limit(limit)
+    ids = db.execute(ranked).scalars().all()
+    if ids:
+        return ids
+    # Nothing contains every term: fall back to typo-tolerant trigram word similarity
+    fuzzy = select(ProductDocument.product_id).where(
+        literal(query).op("<%")(ProductDocument.search_text)
+    ).order_by(similarity.desc(), ProductDocument.product_id).limit(limit)
+    return db.execute(fuzzy).scalars().all()
+
+
+def _search_ids_sqlite(db: Session, query: str, terms: list[str], limit: int) -> list[int]:
+    match_terms = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+    short_terms = [term for term in terms if len(term) < TRIGRAM_MIN_LENGTH]
+    if not match_terms:
+        # Too short for the trigram index: plain scan of the documents (fine for local data sizes)
+        base = select(ProductDocument.product_id)
+        for term in short_terms:
+            base = base.where(ProductDocument.search_text.contains(term, autoescape=True))
+        ranked = base.order_by(_code_rank(query), ProductDocument.product_id).limit(limit)
+        return db.execute(ranked).scalars().all()
+
+    match = " ".join('"' + term.replace('"', '""') + '"' for term in match_terms)
+    base = (
+        select(ProductDocument.product_id)
+        .join(product_search, product_search.c.rowid == ProductDocument.product_id)
+        .where(text("product_search MATCH :match").bindparams(match=match))
+    )
+    for term in short_terms:
+        base = base.where(ProductDocument.search_text.contains(term, autoescape=True))
+    ranked = base.order_by(_code_rank(query), product_search.c.rank, ProductDocument.product_id).limit(limit)
+    return db.execute(ranked).scalars().all()
+
+
+def search_product_ids(db: Session, query: str, limit: int = 20) -> list[int]:
+    """Ids of the products whose search text contains every term of the query, best match first"""
+    query = normalize_search_text(query)
+    terms = query.split(" ") if query else []
+    if not terms:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_ids_postgresql(db, query, terms, limit)
+    return _search_ids_sqlite(db, query, terms, limit)
+
+
+def search_product_documents(db: Session, query: str, limit: int = 20) -> list[dict]:
+    """Matching product documents in rank order"""
+    product_ids = search_product_ids(db, query, limit)
+    if not product_ids:
+        return []
+    documents = {document["id"]: document for document in get_product_documents(db, product_ids)}
+    return [documents[product_id] for product_id in product_ids if product_id in documents]
@@ -0,0 +1,53 @@
+import logging
+from app.config import DB_REPEATED_QUERY_THRESHOLD
+from app.db.query_stats import QueryStats, current_query_stats
+from app.utils.metrics import route_label
+
+logger = logging.getLogger("app.db.queries")
+
+
+class QueryDebugMiddleware:
+    """Debug-mode SQL profiler.
+
+    Adds X-DB-Query-Count / X-DB-Time headers to every response and logs the
+    statement shapes a single request ran more than DB_REPEATED_QUERY_THRESHOLD
+    times, with the route that ran them. Headers are written when the response
+    starts, so statements of a streamed body are only in the log line.
+    """
+
+    def __init__(self, app, threshold: int = DB_REPEATED_QUERY_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Share the request's stats with the metrics middleware when it is installed
+        stats = current_query_stats.get()
+        token = None
+        if stats is None:
+            stats = QueryStats()
+            token = current_query_stats.set(stats)
+        stats.track_shapes()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time", f"{stats.total_seconds * 1000:.2f}ms".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                current_query_stats.reset(token)
+            route = f"{scope['method']} {route_label(scope)}"
+            for shape, count in stats.repeated(self.threshold):
+                logger.warning("Possible N+1 on %s: %d executions of %s", route, count, shape)
+            logger.debug(
+                "%s ran %d statements in %.2f ms", route, stats.count, stats.total_seconds * 1000
+            )
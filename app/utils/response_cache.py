@@ -0,0 +1,122 @@
+import gzip
+import hashlib
+import time
+from typing import Any, Callable
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.config import REFERENCE_CACHE_MAX_AGE, REFERENCE_CACHE_TTL_SECONDS
+from app.utils.conditional import check_not_modified
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 500
+
+
+class CachedResponse:
+    """A pre-serialized JSON body, its gzip encoding and its validators"""
+
+    def __init__(self, body: bytes, last_modified=None):
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+        self.etag = f'W/"{hashlib.sha1(body).hexdigest()[:24]}"'
+        self.last_modified = last_modified
+        self.loaded_at = time.monotonic()
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+    def headers(self) -> dict:
+        return {"Cache-Control": f"public, max-age={REFERENCE_CACHE_MAX_AGE}", "Vary": "Accept-Encoding"}
+
+
+class ResponseCache:
+    """Process-wide cache of serialized list responses, keyed by resource name.
+
+    Like the attribute catalog cache, writes in this process invalidate an entry
+    right away and the TTL bounds how stale another worker's copy can get. No
+    lock is taken: a response loaded while an invalidation happened is served
+    but not stored, because the key's version no longer matches.
+    """
+
+    def __init__(self, ttl_seconds: float = REFERENCE_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, CachedResponse] = {}
+        self._versions: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, load: Callable[[], CachedResponse]) -> CachedResponse:
+        entry = self._entries.get(key)
+        if entry is not None and (self.ttl_seconds <= 0 or entry.age_seconds < self.ttl_seconds):
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        version = self._versions.get(key, 0)
+        entry = load()
+        if self._versions.get(key, 0) == version:
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self, *keys: str):
+        """Drop the given entries, or all of them when no key is given"""
+        for key in keys or set(self._entries) | set(self._versions):
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": {key: round(entry.age_seconds, 3) for key, entry in self._entries.items()},
+        }
+
+
+reference_cache = ResponseCache()
+
+# key -> (response model, rows loader taking a session); filled by the routers, used for warm-up
+reference_lists: dict[str, tuple[Any, Callable[[Any], list]]] = {}
+
+
+def reference_list(key: str, response_model: Any):
+    """Register a router's list loader so startup can preload its cached response"""
+    def register(load_rows: Callable[[Any], list]):
+        reference_lists[key] = (response_model, load_rows)
+        return load_rows
+    return register
+
+
+def build_cached_response(response_model: Any, rows: list) -> CachedResponse:
+    adapter = TypeAdapter(response_model)
+    body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    timestamps = [row.last_modified_date for row in rows if row.last_modified_date is not None]
+    return CachedResponse(body, max(timestamps, default=None))
+
+
+def preload_reference_lists(db) -> list[str]:
+    """Fill the cache for every registered list that is not cached yet"""
+    for key, (response_model, load_rows) in reference_lists.items():
+        reference_cache.get(key, lambda: build_cached_response(response_model, load_rows(db)))
+    return list(reference_lists)
+
+
+def cached_list_response(request: Request, key: str, response_model: Any, load_rows: Callable[[], list]) -> Response:
+    """Serve a reference-data list from the cache; a hit does no database or Pydantic work"""
+    entry = reference_cache.get(key, lambda: build_cached_response(response_model, load_rows()))
+    headers = entry.headers()
+    if entry.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", "").lower():
+        headers["Content-Encoding"] = "gzip"
+        response = Response(entry.gzip_body, media_type="application/json", headers=headers)
+    else:
+        response = Response(entry.body, media_type="application/json", headers=headers)
+
+    not_modified = check_not_modified(request, response, entry.etag, entry.last_modified)
+    if not_modified:
+        not_modified.headers.update(entry.headers())
+        return not_modified
+    return response
+
+
+def invalidate_reference_cache(*keys: str):
+    reference_cache.invalidate(*keys)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import configure_mappers
+from app.config import DB_POOL_WARMUP_CONNECTIONS, FACET_INDEX_ENABLED, STARTUP_WARMUP
+from app.db import session
+from app.db.init_db import init_db
+from app.schemas.product import (
+    create_dynamic_product_create_schema, create_dynamic_product_out_schema, create_dynamic_product_update_schema
+)
+from app.utils.attribute_catalog import get_attribute_catalog
+from app.utils.facet_index import facet_index
+from app.utils.response_cache import preload_reference_lists
+
+logger = logging.getLogger("app.startup")
+
+# Delay between warm-up attempts while the database is unavailable
+WARMUP_RETRY_SECONDS = 5.0
+
+
+class StartupState:
+    """Readiness of this worker: false until warm-up has finished, and again while shutting down"""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at = time.time()
+        self.warmup_seconds: Optional[float] = None
+        self.steps: dict[str, float] = {}
+        self.attempts = 0
+        self.error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "warmup_seconds": self.warmup_seconds,
+            "warmup_steps_ms": self.steps,
+            "warmup_attempts": self.attempts,
+            "error": self.error,
+        }
+
+
+startup_state = StartupState()
+
+
+def _timed(name: str, step: Callable):
+    start = time.perf_counter()
+    result = step()
+    startup_state.steps[name] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def open_pool_connections(engine: Engine, count: int):
+    """Hold `count` connections at once, then return them: the pool keeps them open"""
+    if engine.dialect.name == "sqlite":
+        count = 1
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+async def open_async_pool_connections(count: int):
+    if session.async_engine is None:
+        return
+    connections = await asyncio.gather(*(session.async_engine.connect().start() for _ in range(count)))
+    for connection in connections:
+        await connection.close()
+
+
+def warm_caches():
+    """Attribute catalog, the dynamic product schemas built from it, reference-data responses and the facet index"""
+    with session.SessionLocal() as db:
+        catalog = _timed("attribute_catalog", lambda: get_attribute_catalog(db))
+
+        def build_schemas():
+            create_dynamic_product_create_schema(catalog.attributes, catalog.fingerprint)
+            create_dynamic_product_update_schema(catalog.attributes, catalog.fingerprint)
+            create_dynamic_product_out_schema(catalog.attributes, catalog.fingerprint)
+            catalog.option_lookup
+        _timed("product_schemas", build_schemas)
+        _timed("reference_cache", lambda: preload_reference_lists(db))
+        if FACET_INDEX_ENABLED:
+            _timed("facet_index", lambda: facet_index.load(db))
+
+
+def warm_up_sync():
+    _timed("mappers", configure_mappers)
+    _timed("db_pool", lambda: open_pool_connections(session.engine, DB_POOL_WARMUP_CONNECTIONS))
+    warm_caches()
+
+
+def start_up_sync():
+    """Schema revision check (or migration), then the warm-up unless STARTUP_WARMUP is off"""
+    _timed("schema_revision", init_db)
+    if STARTUP_WARMUP:
+        warm_up_sync()
+
+
+async def warm_up():
+    """Check the schema and warm up off the event loop, retrying until both succeed, then report ready.
+
+    A database that is unreachable or not yet migrated keeps the worker alive and
+    /health/ready at 503 instead of failing startup.
+    """
+    started = time.perf_counter()
+    while True:
+        startup_state.attempts += 1
+        try:
+            await asyncio.to_thread(start_up_sync)
+            if STARTUP_WARMUP and session.async_engine is not None:
+                start = time.perf_counter()
+                await open_async_pool_connections(DB_POOL_WARMUP_CONNECTIONS)
+                startup_state.steps["async_db_pool"] = round((time.perf_counter() - start) * 1000, 2)
+            break
+        except Exception as e:
+            startup_state.error = f"{type(e).__name__}: {e}"
+            logger.exception("Startup attempt %d failed; retrying in %.0fs", startup_state.attempts, WARMUP_RETRY_SECONDS)
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+
+    startup_state.error = None
+    startup_state.warmup_seconds = round(time.perf_counter() - started, 3)
+    startup_state.ready = True
+    logger.info("Startup finished in %.3fs: %s", startup_state.warmup_seconds, startup_state.steps)
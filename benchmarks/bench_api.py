@@ -0,0 +1,251 @@
+"""Benchmark the product API in-process and compare against a stored baseline.
+
+    python -m benchmarks.bench_api [--products 2000] [--attributes 30] [--options 5]
+                                   [--attributes-per-product 15] [--requests 200]
+                                   [--database-url sqlite:///./bench.db]
+                                   [--output benchmarks/results/latest.json]
+                                   [--baseline benchmarks/baseline.json] [--save-baseline]
+
+A fresh catalog is seeded deterministically (see benchmarks/seed.py) unless
+--reuse is given. Each scenario drives the FastAPI app through TestClient and
+reports p50/p95/p99 latency, throughput and SQL statements per request.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_DATABASE_URL = "sqlite:///./bench.db"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Product API benchmark")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", DEFAULT_DATABASE_URL),
+                        help="Database to seed and benchmark; its tables are dropped unless --reuse")
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--attributes", type=int, default=30)
+    parser.add_argument("--options", type=int, default=5, help="Options per attribute")
+    parser.add_argument("--attributes-per-product", type=int, default=15)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--page-depths", default="1,10,100", help="Comma-separated page numbers for get_products")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reuse", action="store_true", help="Benchmark the existing data instead of reseeding")
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative p95 slowdown reported as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions")
+    return parser.parse_args()
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def run_scenario(name: str, make_request, requests: int, warmup: int) -> dict:
+    """Call make_request(i) `warmup + requests` times and summarize the measured calls"""
+    from app.db.query_stats import collect_queries
+
+    for i in range(warmup):
+        make_request(-1 - i)
+
+    timings, query_counts, errors = [], [], 0
+    started = time.perf_counter()
+    for i in range(requests):
+        with collect_queries() as stats:
+            start = time.perf_counter()
+            response = make_request(i)
+            timings.append((time.perf_counter() - start) * 1000)
+        query_counts.append(stats.count)
+        if response.status_code >= 400:
+            errors += 1
+    wall_seconds = time.perf_counter() - started
+
+    timings.sort()
+    result = {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(timings, 0.50), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+        "mean_ms": round(statistics.fmean(timings), 3) if timings else 0.0,
+        "throughput_rps": round(requests / wall_seconds, 1) if wall_seconds else 0.0,
+        "queries_per_request": round(statistics.fmean(query_counts), 2) if query_counts else 0.0,
+        "max_queries": max(query_counts, default=0),
+    }
+    print(f"  {name:<28} p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+          f"p99 {result['p99_ms']:8.2f} ms  {result['throughput_rps']:8.1f} req/s  "
+          f"{result['queries_per_request']:5.1f} queries" + (f"  {errors} errors" if errors else ""))
+    return result
+
+
+def build_scenarios(client, args, catalog_info: dict) -> dict:
+    """Request factories per scenario; reads first so writes do not change what they measure"""
+    from sqlalchemy import select
+    from app.db.session import SessionLocal
+    from app.models import AttributeOption, Product
+    from app.utils.pagination import encode_cursor
+    from benchmarks.seed import attribute_code, product_code
+
+    rng = random.Random(args.seed)
+    products = catalog_info["products"]
+    with SessionLocal() as db:
+        product_ids = db.execute(select(Product.id).order_by(Product.id)).scalars().all()
+        options_by_code: dict[str, list[str]] = {}
+        for code, option_en in db.execute(select(AttributeOption.attribute_code, AttributeOption.attribute_option_en)):
+            options_by_code.setdefault(code, []).append(option_en)
+
+    def random_attributes(count: int) -> dict:
+        codes = rng.sample(sorted(options_by_code), min(count, len(options_by_code)))
+        return {code: rng.choice(options_by_code[code]) for code in codes}
+
+    scenarios = {
+        "get_available_attributes": lambda i: client.get("/products/available-attributes"),
+        "get_product_by_code": lambda i: client.get(f"/products/code/{product_code(rng.randrange(products))}"),
+    }
+
+    for depth in [int(depth) for depth in args.page_depths.split(",") if depth.strip()]:
+        offset = (depth - 1) * args.page_size
+        if offset >= len(product_ids):
+            continue
+        params = {"limit": args.page_size}
+        if offset:
+            params["cursor"] = encode_cursor("id", [product_ids[offset - 1]])
+        scenarios[f"get_products_page_{depth}"] = lambda i, params=params: client.get("/products/", params=params)
+
+    filter_code = attribute_code(0)
+    if filter_code in options_by_code:
+        filter_params = {"limit": args.page_size, f"attr.{filter_code}": options_by_code[filter_code][0], "facets": "true"}
+        scenarios["get_products_filtered_facets"] = lambda i: client.get("/products/", params=filter_params)
+
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+
+    def create(i: int):
+        return client.post("/products/", json={
+            "product_code": f"BENCH-NEW-{run_id}-{i}",
+            "status": "Active",
+            "vendor_code": "V1",
+            "operator_code": "O1",
+            "supported_countries": "VN",
+            "attribute": random_attributes(catalog_info["attributes_per_product"]),
+        })
+
+    def update(i: int):
+        product_id = rng.choice(product_ids)
+        return client.put(f"/products/{product_id}", json={"attribute": random_attributes(3)})
+
+    scenarios["create_product"] = create
+    scenarios["update_product"] = update
+    return scenarios
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe scenarios whose p95 got slower than the baseline by more than `threshold`"""
+    regressions = []
+    print(f"\nCompared with baseline from {baseline.get('meta', {}).get('timestamp', '?')}:")
+    for name, result in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            print(f"  {name:<28} (new scenario)")
+            continue
+        change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        queries = result["queries_per_request"] - before["queries_per_request"]
+        flag = ""
+        if change > threshold or queries > 0:
+            flag = "  REGRESSION"
+            regressions.append(f"{name}: p95 {change:+.0%}, queries {queries:+.1f}")
+        print(f"  {name:<28} p95 {before['p95_ms']:8.2f} -> {result['p95_ms']:8.2f} ms ({change:+.0%})  "
+              f"queries {before['queries_per_request']:5.1f} -> {result['queries_per_request']:5.1f}{flag}")
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main() -> int:
+    args = parse_args()
+    # app.config reads the environment at import time
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from fastapi.testclient import TestClient
+    from app.db.backfill_product_documents import backfill_product_documents
+    from app.db.migrations import drop_database_schema, upgrade_database
+    from app.db.session import engine
+    from app.main import app
+    from benchmarks.seed import seed_catalog
+
+    catalog_info = {
+        "products": args.products,
+        "attributes": args.attributes,
+        "options_per_attribute": args.options,
+        "attributes_per_product": min(args.attributes_per_product, args.attributes),
+        "seed": args.seed,
+    }
+    if not args.reuse:
+        print(f"Seeding {args.products} products x {catalog_info['attributes_per_product']} attributes ...")
+        started = time.perf_counter()
+        drop_database_schema(engine)
+        upgrade_database(engine)
+        catalog_info = seed_catalog(
+            engine, args.products, args.attributes, args.options, args.attributes_per_product, seed=args.seed
+        )
+        backfill_product_documents()
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "database": engine.url.get_backend_name(),
+            "catalog": catalog_info,
+            "requests_per_scenario": args.requests,
+        },
+        "scenarios": {},
+    }
+
+    with TestClient(app) as client:
+        print("Scenarios:")
+        for name, make_request in build_scenarios(client, args, catalog_info).items():
+            results["scenarios"][name] = run_scenario(name, make_request, args.requests, args.warmup)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    regressions = []
+    baseline_path = Path(args.baseline)
+    if baseline_path.exists() and not args.save_baseline:
+        regressions = compare(results, json.loads(baseline_path.read_text()), args.threshold)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {baseline_path}")
+
+    if regressions and args.fail_on_regression:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
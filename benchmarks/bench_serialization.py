@@ -0,0 +1,98 @@
+"""Compare the Pydantic and fast JSON paths of GET /products on 1000-row pages.
+
+    python -m benchmarks.bench_serialization [--rows 1000] [--attributes 30] [--repeat 20]
+
+Products are synthetic in-memory rows, so only formatting and serialization are
+measured, not the query.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.schemas.product import (
+    AvailableAttribute, ProductList, create_dynamic_product_out_schema, format_product_for_dynamic_schema
+)
+from app.utils.attribute_catalog import AttributeCatalog
+from app.utils.enums.status import Status
+from app.utils import fast_json
+
+
+def build_catalog(n_attributes: int, n_options: int) -> AttributeCatalog:
+    attributes, attribute_ids = [], {}
+    option_id = 0
+    for i in range(n_attributes):
+        options = []
+        for j in range(n_options):
+            option_id += 1
+            options.append({"id": option_id, "attribute_option_en": f"Option {i}.{j}", "attribute_option_vn": f"Tùy chọn {i}.{j}"})
+        attributes.append(AvailableAttribute(
+            attribute_code=f"attr_{i}", attribute_name_en=f"Attribute {i}", attribute_name_vn=f"Thuộc tính {i}",
+            type_attribute="Select", attribute_group="product", options=options
+        ))
+        attribute_ids[f"attr_{i}"] = i + 1
+    return AttributeCatalog(attributes, attribute_ids, version=0)
+
+
+def build_products(n_rows: int, catalog: AttributeCatalog) -> list:
+    now = datetime.now(timezone.utc)
+    products = []
+    for product_id in range(1, n_rows + 1):
+        values = [
+            SimpleNamespace(attribute_id=attribute_id, attribute_option_id=attr.options[product_id % len(attr.options)]["id"])
+            for attr, attribute_id in zip(catalog.attributes, catalog.attribute_ids.values())
+        ]
+        products.append(SimpleNamespace(
+            id=product_id, product_code=f"SKU-{product_id:06d}", status=Status.ACTIVE, vendor_code="VENDOR",
+            operator_code="OPERATOR", supported_countries="VN,TH", note=None, date_created=now,
+            last_modified_date=now, product_attribute_value_index=values
+        ))
+    return products
+
+
+def pydantic_path(products, catalog) -> bytes:
+    """What get_products does by default: one model per row, then jsonable_encoder"""
+    ProductOutSchema = create_dynamic_product_out_schema(catalog.attributes, catalog.fingerprint)
+    items = [ProductOutSchema(**format_product_for_dynamic_schema(product, catalog)) for product in products]
+    result = ProductList(products=items, size=len(items))
+    return JSONResponse(jsonable_encoder(result)).body
+
+
+def fast_path(products, catalog) -> bytes:
+    """FAST_JSON_RESPONSES=true: plain dicts straight to bytes"""
+    items = [format_product_for_dynamic_schema(product, catalog) for product in products]
+    return fast_json.FastJSONResponse({"products": items, "size": len(items)}).body
+
+
+def measure(func, repeat: int, *args) -> list[float]:
+    func(*args)  # warm up schema memoization
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--attributes", type=int, default=30)
+    parser.add_argument("--options", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.attributes, args.options)
+    products = build_products(args.rows, catalog)
+
+    print(f"{args.rows} products x {args.attributes} attributes, json backend: "
+          f"{'orjson' if fast_json.orjson is not None else 'json'}")
+    results = {}
+    for name, func in (("pydantic", pydantic_path), ("fast", fast_path)):
+        timings = measure(func, args.repeat, products, catalog)
+        results[name] = statistics.median(timings)
+        print(f"  {name:<9} median {results[name]:8.2f} ms   min {min(timings):8.2f} ms   "
+              f"body {len(func(products, catalog)) / 1024:.0f} KiB")
+    print(f"  speedup   {results['pydantic'] / results['fast']:.1f}x")
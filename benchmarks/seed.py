@@ -0,0 +1,95 @@
+"""Deterministic benchmark catalog: reference data, product attributes and products."""
+import random
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+from app.models import (
+    Attribute, AttributeGroup, AttributeGroupLink, AttributeOption, Country, Operator, Product,
+    ProductAttributeValueIndex, Vendor
+)
+from app.models.attribute import AttributeType
+from app.models.attribute_group import AttributeGroupName
+from app.utils.enums.status import Status
+
+COUNTRY_CODES = ["VN", "TH", "SG", "MY", "ID", "PH", "JP", "KR"]
+
+
+def attribute_code(index: int) -> str:
+    return f"attr_{index:03d}"
+
+
+def product_code(index: int) -> str:
+    return f"BENCH-{index:07d}"
+
+
+def seed_catalog(
+    engine: Engine,
+    products: int,
+    attributes: int,
+    options: int,
+    attributes_per_product: int,
+    seed: int = 42,
+    batch_size: int = 5000,
+) -> dict:
+    """Fill an empty database with Core multi-row inserts; returns what was created"""
+    rng = random.Random(seed)
+    attributes_per_product = min(attributes_per_product, attributes)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Country), [
+            {"country_code": code, "country_name_vn": code, "country_name_en": code, "seo_url_key": code.lower()}
+            for code in COUNTRY_CODES
+        ])
+        conn.execute(insert(Vendor), [{"vendor_code": f"V{i}", "vendor_name": f"Vendor {i}"} for i in range(10)])
+        conn.execute(insert(Operator), [
+            {"operator_code": f"O{i}", "operator_name": f"Operator {i}", "country_code": COUNTRY_CODES[i % len(COUNTRY_CODES)]}
+            for i in range(20)
+        ])
+
+        group_id = conn.execute(
+            insert(AttributeGroup).returning(AttributeGroup.id), [{"group_name": AttributeGroupName.product}]
+        ).scalar_one()
+        conn.execute(insert(Attribute), [
+            {"attribute_code": attribute_code(i), "attribute_name_en": f"Attribute {i}",
+             "attribute_name_vn": f"Thuộc tính {i}", "type_attribute": AttributeType.select}
+            for i in range(attributes)
+        ])
+        attribute_ids = dict(conn.execute(select(Attribute.attribute_code, Attribute.id)).all())
+        conn.execute(insert(AttributeGroupLink), [
+            {"attribute_id": attribute_id, "group_id": group_id} for attribute_id in attribute_ids.values()
+        ])
+        conn.execute(insert(AttributeOption), [
+            {"attribute_code": attribute_code(i), "attribute_option_en": f"Option {i}.{j}",
+             "attribute_option_vn": f"Tùy chọn {i}.{j}"}
+            for i in range(attributes) for j in range(options)
+        ])
+        option_ids: dict[int, list[int]] = {}
+        for code, option_id in conn.execute(
+            select(AttributeOption.attribute_code, AttributeOption.id).order_by(AttributeOption.id)
+        ):
+            option_ids.setdefault(attribute_ids[code], []).append(option_id)
+
+    attribute_id_list = sorted(attribute_ids.values())
+    for start in range(0, products, batch_size):
+        stop = min(start + batch_size, products)
+        with engine.begin() as conn:
+            inserted = conn.execute(insert(Product).returning(Product.id, sort_by_parameter_order=True), [
+                {"product_code": product_code(i), "status": Status.ACTIVE, "vendor_code": f"V{i % 10}",
+                 "operator_code": f"O{i % 20}", "supported_countries": COUNTRY_CODES[i % len(COUNTRY_CODES)]}
+                for i in range(start, stop)
+            ]).scalars().all()
+            values = [
+                {"product_id": product_id, "attribute_id": attribute_id,
+                 "attribute_option_id": rng.choice(option_ids[attribute_id])}
+                for product_id in inserted
+                for attribute_id in rng.sample(attribute_id_list, attributes_per_product)
+            ]
+            if values:
+                conn.execute(insert(ProductAttributeValueIndex), values)
+
+    return {
+        "products": products,
+        "attributes": attributes,
+        "options_per_attribute": options,
+        "attributes_per_product": attributes_per_product,
+        "seed": seed,
+    }
@@ -0,0 +1,275 @@
+"""Generate a synthetic product catalog for load and scale testing.
+
+    python generate_catalog.py --products 1000000 --attributes 40 --attributes-per-product 25 --workers 8 --drop
+
+Creates countries, vendors, operators, attributes in the 'product' attribute
+group with their options, then products and their ProductAttributeValueIndex
+rows. Products are written by parallel worker processes, one transaction per
+batch (COPY on PostgreSQL, multi-row INSERT elsewhere). Every batch draws from
+its own RNG derived from --seed, so the catalog is identical whatever the
+number of workers. Run `python -m app.db.backfill_product_documents` afterwards
+to build the product read model.
+"""
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import random
+import time
+
+STATUS_WEIGHTS = {"ACTIVE": 80, "INACTIVE": 10, "LOW_STOCK": 4, "B2B_ONLY": 3, "TEMPORARY": 2, "PREPARING": 1}
+COUNTRY_CODES = [
+    "VN", "TH", "SG", "MY", "ID", "PH", "JP", "KR", "CN", "TW", "HK", "AU", "NZ", "US", "CA", "GB",
+    "FR", "DE", "IT", "ES", "NL", "CH", "AE", "TR", "IN", "KH", "LA", "MM", "MO", "BR",
+]
+
+
+def attribute_code(index: int) -> str:
+    return f"attr_{index:03d}"
+
+
+def product_code(index: int) -> str:
+    return f"SKU-{index:08d}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a synthetic product catalog")
+    parser.add_argument("--database-url", default=None, help="Defaults to DATABASE_URL / DB_* settings")
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--attributes", type=int, default=40)
+    parser.add_argument("--options", type=int, default=8, help="Options per attribute")
+    parser.add_argument("--attributes-per-product", type=int, default=25)
+    parser.add_argument("--option-skew", type=float, default=1.0,
+                        help="Zipf exponent of option popularity (0 = uniform)")
+    parser.add_argument("--countries", type=int, default=20)
+    parser.add_argument("--vendors", type=int, default=50)
+    parser.add_argument("--operators", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=5000, help="Products per worker transaction")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--drop", action="store_true", help="Drop all tables first; the schema is then migrated to head")
+    return parser.parse_args()
+
+
+class CatalogSpec:
+    """Everything a worker needs to generate any batch of products on its own"""
+
+    def __init__(self, args, attribute_ids: list[int], option_ids: dict[int, list[int]]):
+        self.seed = args.seed
+        self.attributes_per_product = min(args.attributes_per_product, len(attribute_ids))
+        self.countries = min(args.countries, len(COUNTRY_CODES))
+        self.vendors = args.vendors
+        self.operators = args.operators
+        self.attribute_ids = attribute_ids
+        self.option_ids = option_ids
+        # Production catalogs are skewed: a few options are used by most products
+        self.option_weights = {
+            attribute_id: [1 / (rank + 1) ** args.option_skew for rank in range(len(options))]
+            for attribute_id, options in option_ids.items()
+        }
+
+
+def seed_reference_data(engine, args) -> CatalogSpec:
+    """Countries, vendors, operators, product attributes and options (small, single transaction)"""
+    from sqlalchemy import insert, select
+    from app.models import Attribute, AttributeGroup, AttributeGroupLink, AttributeOption, Country, Operator, Vendor
+    from app.models.attribute import AttributeType
+    from app.models.attribute_group import AttributeGroupName
+
+    rng = random.Random(args.seed)
+    countries = COUNTRY_CODES[:min(args.countries, len(COUNTRY_CODES))]
+    with engine.begin() as conn:
+        conn.execute(insert(Country), [
+            {"country_code": code, "country_name_vn": code, "country_name_en": code, "seo_url_key": code.lower()}
+            for code in countries
+        ])
+        conn.execute(insert(Vendor), [{"vendor_code": f"V{i:04d}", "vendor_name": f"Vendor {i}"} for i in range(args.vendors)])
+        conn.execute(insert(Operator), [
+            {"operator_code": f"O{i:05d}", "operator_name": f"Operator {i}", "country_code": rng.choice(countries)}
+            for i in range(args.operators)
+        ])
+
+        group_id = conn.execute(
+            select(AttributeGroup.id).where(AttributeGroup.group_name == AttributeGroupName.product)
+        ).scalar()
+        if group_id is None:
+            group_id = conn.execute(
+                insert(AttributeGroup).returning(AttributeGroup.id), [{"group_name": AttributeGroupName.product}]
+            ).scalar_one()
+        conn.execute(insert(Attribute), [
+            {"attribute_code": attribute_code(i), "attribute_name_en": f"Attribute {i}",
+             "attribute_name_vn": f"Thuộc tính {i}", "type_attribute": AttributeType.select}
+            for i in range(args.attributes)
+        ])
+        attribute_ids = dict(conn.execute(
+            select(Attribute.attribute_code, Attribute.id).where(
+                Attribute.attribute_code.in_([attribute_code(i) for i in range(args.attributes)])
+            )
+        ).all())
+        conn.execute(insert(AttributeGroupLink), [
+            {"attribute_id": attribute_id, "group_id": group_id} for attribute_id in attribute_ids.values()
+        ])
+        conn.execute(insert(AttributeOption), [
+            {"attribute_code": attribute_code(i), "attribute_option_en": f"Option {i}.{j}",
+             "attribute_option_vn": f"Tùy chọn {i}.{j}"}
+            for i in range(args.attributes) for j in range(args.options)
+        ])
+        option_ids: dict[int, list[int]] = {}
+        for code, option_id in conn.execute(
+            select(AttributeOption.attribute_code, AttributeOption.id)
+            .where(AttributeOption.attribute_code.in_(list(attribute_ids)))
+            .order_by(AttributeOption.id)
+        ):
+            option_ids.setdefault(attribute_ids[code], []).append(option_id)
+
+    return CatalogSpec(args, sorted(attribute_ids.values()), option_ids)
+
+
+def generate_batch(spec: CatalogSpec, batch_index: int, first_id: int, count: int) -> tuple[list[dict], list[dict]]:
+    """Product and attribute value rows of one batch; depends only on the seed and batch index"""
+    rng = random.Random(spec.seed * 1_000_003 + batch_index)
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    products, values = [], []
+    for product_id in range(first_id, first_id + count):
+        products.append({
+            "id": product_id,
+            "product_code": product_code(product_id),
+            "status": rng.choices(statuses, weights)[0],
+            "vendor_code": f"V{rng.randrange(spec.vendors):04d}",
+            "operator_code": f"O{rng.randrange(spec.operators):05d}",
+            "supported_countries": COUNTRY_CODES[rng.randrange(spec.countries)],
+        })
+        for attribute_id in rng.sample(spec.attribute_ids, spec.attributes_per_product):
+            option_id = rng.choices(spec.option_ids[attribute_id], spec.option_weights[attribute_id])[0]
+            values.append({"product_id": product_id, "attribute_id": attribute_id, "attribute_option_id": option_id})
+    return products, values
+
+
+def _copy_rows(cursor, table: str, columns: list[str], rows: list[dict]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in columns])
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def write_batch(engine, products: list[dict], values: list[dict]):
+    """One transaction per batch: COPY with psycopg2, multi-row INSERT otherwise"""
+    from sqlalchemy import insert
+    from app.models import Product, ProductAttributeValueIndex
+    from app.utils.enums.status import Status
+
+    if engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2":
+        # Enum columns store the member name
+        connection = engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                _copy_rows(cursor, "product", list(products[0]), products)
+                if values:
+                    _copy_rows(cursor, "product_attribute_value_index", list(values[0]), values)
+            connection.commit()
+        finally:
+            connection.close()
+        return
+
+    for product in products:
+        product["status"] = Status[product["status"]]
+    with engine.begin() as conn:
+        conn.execute(insert(Product), products)
+        if values:
+            conn.execute(insert(ProductAttributeValueIndex), values)
+
+
+_worker_engine = None
+_worker_spec = None
+
+
+def _init_worker(database_url: str, spec: CatalogSpec):
+    global _worker_engine, _worker_spec
+    from sqlalchemy import create_engine
+    # Each process needs its own connections; a forked parent pool must not be reused
+    if database_url.startswith("sqlite"):
+        _worker_engine = create_engine(database_url)
+    else:
+        _worker_engine = create_engine(database_url, pool_size=1, max_overflow=0)
+    _worker_spec = spec
+
+
+def _run_batch(task: tuple[int, int, int]) -> int:
+    batch_index, first_id, count = task
+    products, values = generate_batch(_worker_spec, batch_index, first_id, count)
+    write_batch(_worker_engine, products, values)
+    return count
+
+
+def reset_sequences(engine):
+    """Explicit ids were inserted; move the PostgreSQL id sequence past them"""
+    from sqlalchemy import text
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(
+                "SELECT setval(pg_get_serial_sequence('product', 'id'), COALESCE((SELECT MAX(id) FROM product), 1))"
+            ))
+
+
+def main():
+    args = parse_args()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from sqlalchemy import func, select
+    from app.config import DATABASE_URL
+    from app.db.migrations import drop_database_schema, upgrade_database
+    from app.db.session import engine
+    from app.models import Product
+
+    if args.drop:
+        drop_database_schema(engine)
+    upgrade_database(engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count(Product.id))).scalar():
+            raise SystemExit("The product table is not empty; pass --drop to regenerate the catalog")
+
+    started = time.perf_counter()
+    spec = seed_reference_data(engine, args)
+    print(f"Reference data: {spec.countries} countries, {args.vendors} vendors, {args.operators} operators, "
+          f"{len(spec.attribute_ids)} attributes x {args.options} options")
+
+    workers = args.workers
+    if engine.dialect.name == "sqlite" and workers > 1:
+        # SQLite has a single writer: parallel workers would only wait on each other's locks
+        print("SQLite: using a single worker")
+        workers = 1
+
+    tasks = [
+        (batch_index, first_id, min(args.batch_size, args.products - first_id + 1))
+        for batch_index, first_id in enumerate(range(1, args.products + 1, args.batch_size))
+    ]
+    # Worker processes build their own engine from the URL
+    engine.dispose()
+    done = 0
+    if workers == 1:
+        _init_worker(DATABASE_URL, spec)
+        results = map(_run_batch, tasks)
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(DATABASE_URL, spec))
+        results = pool.imap_unordered(_run_batch, tasks)
+    for count in results:
+        done += count
+        elapsed = time.perf_counter() - started
+        print(f"\r{done}/{args.products} products  {done / elapsed:,.0f} products/s", end="", flush=True)
+    if workers > 1:
+        pool.close()
+        pool.join()
+
+    reset_sequences(engine)
+    elapsed = time.perf_counter() - started
+    print(f"\nGenerated {args.products} products with {args.products * spec.attributes_per_product} attribute values "
+          f"in {elapsed:.1f}s")
+    print("Build the product read model with: python -m app.db.backfill_product_documents")
+
+
+if __name__ == "__main__":
+    main()
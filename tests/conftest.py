@@ -0,0 +1,95 @@
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway SQLite file before app.config is imported
+_db_dir = tempfile.mkdtemp(prefix="backend_pro_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["DB_ASYNC"] = "false"
+os.environ["FACET_INDEX_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.db import session  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import (  # noqa: E402
+    Attribute, AttributeGroup, AttributeGroupLink, AttributeOption, Country, Operator, Vendor
+)
+from app.models.attribute import AttributeType  # noqa: E402
+from app.models.attribute_group import AttributeGroupName  # noqa: E402
+from app.utils.attribute_catalog import invalidate_attribute_catalog  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Not used as a context manager: the lifespan (migrations, warm-up) is not run
+    Base.metadata.create_all(session.engine)
+    invalidate_attribute_catalog()
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def catalog(client):
+    """Reference data plus a 'product' group with a few select attributes"""
+    with session.SessionLocal() as db:
+        db.add(Country(country_code="VN", country_name_vn="Việt Nam", country_name_en="Vietnam", seo_url_key="vn"))
+        db.add(Vendor(vendor_code="V1", vendor_name="Vendor 1"))
+        db.add(Operator(operator_code="O1", operator_name="Operator 1", country_code="VN"))
+        group = AttributeGroup(group_name=AttributeGroupName.product)
+        db.add(group)
+        db.flush()
+        for index in range(3):
+            attribute = Attribute(
+                attribute_code=f"attr_{index}", attribute_name_vn=f"Thuộc tính {index}",
+                attribute_name_en=f"Attribute {index}", type_attribute=AttributeType.select
+            )
+            db.add(attribute)
+            db.flush()
+            db.add(AttributeGroupLink(attribute_id=attribute.id, group_id=group.id))
+            for option in range(4):
+                db.add(AttributeOption(
+                    attribute_code=attribute.attribute_code,
+                    attribute_option_en=f"Option {index}.{option}",
+                    attribute_option_vn=f"Tùy chọn {index}.{option}"
+                ))
+        db.commit()
+    invalidate_attribute_catalog()
+
+
+@pytest.fixture(scope="session")
+def products(client, catalog):
+    """Ids of a page worth of products, each with every attribute set"""
+    ids = []
+    for number in range(20):
+        response = client.post("/products/", json={
+            "product_code": f"SIM-{number:03d}",
+            "vendor_code": "V1",
+            "operator_code": "O1",
+            "supported_countries": "VN",
+            "attribute": {f"attr_{index}": f"Option {index}.{number % 4}" for index in range(3)},
+        })
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+    return ids
+
+
+@pytest.fixture(scope="session")
+def create_product(client, catalog):
+    """Create a product through the API and return its JSON.
+
+    Tests leave attr_1 unset so that attr_1 filters and facets only see the `products` fixture.
+    """
+    def create(product_code: str, **fields):
+        response = client.post("/products/", json={
+            "product_code": product_code,
+            "vendor_code": "V1",
+            "operator_code": "O1",
+            "supported_countries": "VN",
+            **fields,
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+    return create
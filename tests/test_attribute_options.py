@@ -0,0 +1,29 @@
+def _option(client, option_id):
+    return next(option for option in client.get("/attribute_options/").json() if option["id"] == option_id)
+
+
+def test_bulk_upsert_keeps_vn_label(client, catalog):
+    response = client.post("/attribute_options/bulk", json={"options": [
+        {"attribute_code": "attr_2", "attribute_option_en": "Upsert A", "attribute_option_vn": "Nâng cấp A"},
+        {"attribute_code": "attr_2", "attribute_option_en": "Upsert B"},
+    ]})
+    assert response.status_code == 200
+    first, second = response.json()["ids"]
+    # Without a VN label a new option falls back to the EN one
+    assert _option(client, second)["attribute_option_vn"] == "Upsert B"
+
+    # Upserting without a VN label must not overwrite the stored one
+    response = client.post("/attribute_options/bulk", json={"options": [
+        {"attribute_code": "attr_2", "attribute_option_en": "Upsert A"},
+        {"attribute_code": "attr_2", "attribute_option_en": "Upsert B", "attribute_option_vn": "Nâng cấp B"},
+    ]})
+    assert response.json()["ids"] == [first, second]
+    assert _option(client, first)["attribute_option_vn"] == "Nâng cấp A"
+    assert _option(client, second)["attribute_option_vn"] == "Nâng cấp B"
+
+
+def test_bulk_upsert_unknown_attribute(client, catalog):
+    response = client.post("/attribute_options/bulk", json={"options": [
+        {"attribute_code": "no_such_attribute", "attribute_option_en": "X"},
+    ]})
+    assert response.status_code == 400
@@ -0,0 +1,84 @@
+from app.utils.product_import import ProductBulkImporter
+
+
+def _row(product_code, **fields):
+    return {"product_code": product_code, "vendor_code": "V1", "operator_code": "O1", "supported_countries": "VN", **fields}
+
+
+def test_bulk_import_reports_row_errors(client, catalog):
+    response = client.post("/products/bulk", json=[
+        _row("BULK-001", attribute={"attr_0": "Option 0.2"}),
+        _row("BULK-002", vendor_code="NOPE"),
+        _row("BULK-001"),
+        _row("BULK-003", attribute={"attr_0": "Option 9.9"}),
+        "not an object",
+        _row("BULK-004"),
+    ])
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["created"], body["failed"]) == (6, 2, 4)
+    assert [product["product_code"] for product in body["products"]] == ["BULK-001", "BULK-004"]
+    errors = {error["row"]: error["detail"] for error in body["errors"]}
+    assert sorted(errors) == [1, 2, 3, 4]
+    assert "Vendor 'NOPE' not found" in errors[1]
+    assert "Duplicate product code" in errors[2]
+
+    created = client.get("/products/code/BULK-001").json()
+    assert created["attribute"]["attr_0"] == "Option 0.2"
+
+
+def test_bulk_import_ndjson(client, catalog):
+    body = b'{"product_code": "BULK-ND-1", "vendor_code": "V1", "operator_code": "O1", "supported_countries": "VN"}\n{oops\n'
+    response = client.post("/products/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    result = response.json()
+    assert (result["created"], result["failed"]) == (1, 1)
+    assert result["errors"][0]["row"] == 1
+    assert "Invalid JSON" in result["errors"][0]["detail"]
+
+
+def test_bulk_import_savepoint_fallback(client, catalog, monkeypatch):
+    client.post("/products/bulk", json=[_row("BULK-SP-TAKEN")])
+    # Let a conflicting code through the up-front checks so the multi-row INSERT fails
+    monkeypatch.setattr(ProductBulkImporter, "_check_references", lambda self, prepared: prepared)
+
+    response = client.post("/products/bulk", json=[_row("BULK-SP-1"), _row("BULK-SP-TAKEN"), _row("BULK-SP-2")])
+    body = response.json()
+    assert [product["product_code"] for product in body["products"]] == ["BULK-SP-1", "BULK-SP-2"]
+    assert [(error["row"], error["product_code"]) for error in body["errors"]] == [(1, "BULK-SP-TAKEN")]
+    assert body["errors"][0]["detail"].startswith("Database error")
+    for product in body["products"]:
+        assert client.get(f"/products/{product['id']}").status_code == 200
+
+
+def test_batch_get_reports_missing_keys(client, products):
+    response = client.post("/products/batch-get", json={
+        "ids": [products[1], 999999, products[0], products[1]],
+        "codes": ["SIM-000", "SIM-005", "NO-SUCH-CODE"],
+    })
+    assert response.status_code == 200
+    body = response.json()
+    # Request order, each product once even when asked for by id and by code
+    assert [product["id"] for product in body["products"]] == [products[1], products[0], products[5]]
+    assert body["size"] == 3
+    assert body["missing_ids"] == [999999]
+    assert body["missing_codes"] == ["NO-SUCH-CODE"]
+
+
+def test_bulk_status(client, create_product):
+    ids = [create_product(f"STATUS-{number}")["id"] for number in range(3)]
+    client.put(f"/products/{ids[0]}", json={"status": "Inactive"})
+
+    response = client.post("/products/bulk-status", json={"status": "Inactive", "ids": ids})
+    assert response.status_code == 200
+    # The product already inactive is left alone
+    assert response.json() == {"status": "Inactive", "updated": 2, "ids": ids[1:]}
+    for product_id in ids:
+        assert client.get(f"/products/{product_id}").json()["status"] == "Inactive"
+
+    response = client.post("/products/bulk-status", json={"status": "Active", "ids": ids, "current_status": "Inactive"})
+    assert response.json()["updated"] == 3
+
+
+def test_bulk_status_requires_a_filter(client, catalog):
+    response = client.post("/products/bulk-status", json={"status": "Inactive"})
+    assert response.status_code == 400
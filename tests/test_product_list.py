@@ -0,0 +1,102 @@
+import pytest
+
+from app.api.v1 import product as product_routes
+from app.db import session
+from app.utils.facet_index import facet_index
+
+ALL_ATTR_1 = {"attr.attr_1": [f"Option 1.{option}" for option in range(4)]}
+
+
+def _walk(client, params):
+    ids, cursor = [], None
+    while True:
+        response = client.get("/products/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        ids.extend(item["id"] for item in body["products"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("order_by", ["id", "last_modified_date"])
+def test_cursor_round_trip(client, products, order_by):
+    ids = _walk(client, {**ALL_ATTR_1, "limit": 7, "order_by": order_by})
+    assert len(ids) == len(set(ids))
+    assert sorted(ids) == sorted(products)
+    if order_by == "id":
+        assert ids == sorted(products)
+
+
+def test_bad_cursor(client, products):
+    response = client.get("/products/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    cursor = client.get("/products/", params={"limit": 1}).json()["next_cursor"]
+    response = client.get("/products/", params={"cursor": cursor, "order_by": "last_modified_date"})
+    assert response.status_code == 400
+    assert "order_by" in response.json()["detail"]
+
+
+def test_attribute_filters(client, products):
+    response = client.get("/products/", params={"attr.attr_1": "Option 1.3", "attr.attr_2": "Option 2.3"})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["products"]] == products[3::4]
+
+    response = client.get("/products/", params={"attr.attr_1": ["Option 1.1", "Option 1.3"]})
+    assert [item["id"] for item in response.json()["products"]] == sorted(products[1::4] + products[3::4])
+
+
+def test_attribute_filter_errors(client, products):
+    assert client.get("/products/", params={"attr.unknown": "x"}).status_code == 400
+    assert client.get("/products/", params={"attr.attr_1": "Option 9.9"}).status_code == 400
+
+
+def test_facets_skip_filtered_attributes(client, products):
+    response = client.get("/products/", params={"attr.attr_1": "Option 1.3", "facets": True, "include_total": True})
+    body = response.json()
+    assert body["total"] == 5
+    assert "attr_1" not in body["facets"]
+    assert [(option["attribute_option_en"], option["count"]) for option in body["facets"]["attr_0"]] == [("Option 0.3", 5)]
+
+
+def test_product_etag(client, create_product):
+    product = create_product("ETAG-001", note="first")
+    url = f"/products/{product['id']}"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    # A second write within the same second must still change the validator
+    client.put(url, json={"note": "second"})
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["note"] == "second"
+    assert response.headers["etag"] != etag
+
+
+def test_product_list_etag(client, products):
+    params = {**ALL_ATTR_1, "limit": 5}
+    etag = client.get("/products/", params=params).headers["etag"]
+    assert client.get("/products/", params=params, headers={"If-None-Match": etag}).status_code == 304
+    # Different query, different validator
+    other = client.get("/products/", params={**params, "limit": 6}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"attr.attr_1": "Option 1.3"},
+    {"attr.attr_1": ["Option 1.1", "Option 1.2"], "attr.attr_2": "Option 2.1"},
+    {"status": "Active", "attr.attr_0": "Option 0.2"},
+])
+def test_facet_index_matches_sql(client, products, monkeypatch, params):
+    params = {**params, "limit": 3, "facets": True, "include_total": True}
+    from_sql = client.get("/products/", params=params).json()
+
+    with session.SessionLocal() as db:
+        facet_index.load(db)
+    monkeypatch.setattr(product_routes, "FACET_INDEX_ENABLED", True)
+    from_index = client.get("/products/", params=params).json()
+
+    for key in ("products", "next_cursor", "total", "facets"):
+        assert from_index[key] == from_sql[key], key
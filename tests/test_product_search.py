@@ -0,0 +1,23 @@
+def _search(client, q):
+    response = client.get("/products/search", params={"q": q})
+    assert response.status_code == 200
+    return [product["product_code"] for product in response.json()["products"]]
+
+
+def test_search_ranks_code_matches_first(client, create_product):
+    # Created worst match first so that id order cannot produce the expected ranking
+    create_product("TRAVEL-PLAN", note="Replaces rank-esim bundles")
+    create_product("RANK-ESIM-XL")
+    create_product("RANK-ESIM")
+    assert _search(client, "rank-esim") == ["RANK-ESIM", "RANK-ESIM-XL", "TRAVEL-PLAN"]
+
+
+def test_search_folds_case_and_accents(client, create_product):
+    create_product("TRAVEL-DN", note="SIM du lịch Đà Nẵng")
+    assert _search(client, "sim du lich da nang") == ["TRAVEL-DN"]
+    assert _search(client, "ĐÀ NẴNG") == ["TRAVEL-DN"]
+
+
+def test_search_matches_option_labels(client, create_product):
+    create_product("TRAVEL-OPT", attribute={"attr_2": "Option 2.2"})
+    assert "TRAVEL-OPT" in _search(client, "tuy chon 2.2")
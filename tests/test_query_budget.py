@@ -0,0 +1,39 @@
+from app.db.query_stats import query_budget
+
+
+def test_product_list_query_budget(client, products):
+    # First call loads the attribute catalog; the budget covers the steady state
+    client.get("/products/")
+    with query_budget(2, max_repeats=1):
+        response = client.get("/products/", params={"limit": 20})
+    assert response.status_code == 200
+    assert response.json()["size"] == 20
+
+
+def test_filtered_product_list_query_budget(client, products):
+    client.get("/products/")
+    with query_budget(2, max_repeats=1):
+        response = client.get("/products/", params={"attr.attr_0": "Option 0.1"})
+    assert response.status_code == 200
+    assert response.json()["size"] == 5
+
+
+def test_product_detail_query_budget(client, products):
+    client.get(f"/products/{products[0]}")
+    for product_id in products[:5]:
+        with query_budget(1):
+            response = client.get(f"/products/{product_id}")
+        assert response.status_code == 200
+        assert response.json()["id"] == product_id
+
+
+def test_query_budget_fails_on_n_plus_one(client, products):
+    # One lookup per product, the shape of an N+1 loop, must trip max_repeats
+    try:
+        with query_budget(100, max_repeats=1):
+            for product_id in products[:3]:
+                client.get(f"/products/{product_id}", params={"dynamic_schema": False})
+    except AssertionError as e:
+        assert "Query budget exceeded" in str(e)
+    else:
+        raise AssertionError("query_budget did not flag the repeated statement")
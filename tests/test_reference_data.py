@@ -0,0 +1,22 @@
+def test_vendor_update_is_visible_in_cached_list(client, catalog):
+    vendor = client.post("/vendors/", json={"vendor_code": "REF-V", "vendor_name": "Before"}).json()
+    assert any(item["vendor_name"] == "Before" for item in client.get("/vendors/").json())
+
+    response = client.put(f"/vendors/{vendor['id']}", json={"vendor_name": "After"})
+    assert response.status_code == 200
+    assert response.json()["vendor_code"] == "REF-V"
+    names = {item["vendor_code"]: item["vendor_name"] for item in client.get("/vendors/").json()}
+    assert names["REF-V"] == "After"
+
+
+def test_country_update_is_visible_in_cached_list(client, catalog):
+    country = client.post("/countries/", json={
+        "country_code": "RF", "country_name_vn": "Trước", "country_name_en": "Before", "seo_url_key": "rf"
+    }).json()
+    client.get("/countries/")
+
+    response = client.put(f"/countries/{country['id']}", json={"country_name_en": "After"})
+    assert response.status_code == 200
+    assert response.json()["country_name_vn"] == "Trước"
+    names = {item["country_code"]: item["country_name_en"] for item in client.get("/countries/").json()}
+    assert names["RF"] == "After"